@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: asyncio API for AES Cipher. Small payloads are processed on the event
+           loop, larger ones in an executor so that the loop is not stalled.
+"""
+
+#-- Import --#
+import asyncio
+import concurrent.futures
+import functools
+from streaming import *
+#- End Import -#
+
+# Payloads up to this size (16 KiB, a few ms with the ttable backend) are processed inline
+INLINE_THRESHOLD = 1 << 14
+# Calls running in the executor at the same time
+MAX_CONCURRENCY = 4
+# Size of the chunks read from a StreamReader (64 KiB)
+STREAM_CHUNK_SIZE = 1 << 16
+
+def _crypt(cls, data, key, mode, iv, padding):
+    """
+    One-shot encryption or decryption, a module-level function so that it can be sent to a process pool
+    """
+    cipher = cls(mode, key, iv, padding)
+    return cipher.update(data) + cipher.finalize()
+
+class Offloader:
+    """
+    Runs CPU-bound calls inline when the payload is small and in an executor otherwise,
+    with at most max_concurrency offloaded calls at a time
+    - attributes : (int) threshold, (int) max_concurrency, (Executor) executor
+    - methods : *init, run, aencrypt, adecrypt, encrypt_stream, decrypt_stream
+    """
+
+    def __init__(self, threshold=INLINE_THRESHOLD, max_concurrency=MAX_CONCURRENCY, executor=None):
+        """
+        - input: (int) threshold in bytes, (int) max_concurrency, (Executor) executor, the default
+                 executor of the loop if None. With a ProcessPoolExecutor, streams still run in
+                 the default executor since their state lives in this process
+        """
+        try:
+            assert (type(threshold) == int) and (threshold >= 0)
+            assert (type(max_concurrency) == int) and (max_concurrency > 0)
+        except AssertionError:
+            raise ValueError("Threshold must be a non-negative integer and max_concurrency a positive integer.")
+        self.threshold = threshold
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        # One semaphore per event loop, an asyncio.Semaphore is bound to the loop using it
+        self._semaphores = {}
+
+    def _semaphore(self, loop):
+        """
+        Semaphore of a running loop, those of closed loops are dropped when a new one is created
+        """
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            for old in [old for old in self._semaphores if old.is_closed()]:
+                del self._semaphores[old]
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def run(self, size, func, *args, stateful=False):
+        """
+        Calls func(*args), in the executor when size exceeds the threshold
+        - input: (int) size of the payload, (function) func, args, (bool) stateful if func
+                 updates an object of this process
+        - output: what func returns
+        """
+        if size <= self.threshold:
+            return func(*args)
+        executor = self.executor
+        if stateful and isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            executor = None
+        loop = asyncio.get_running_loop()
+        async with self._semaphore(loop):
+            return await loop.run_in_executor(executor, functools.partial(func, *args))
+
+    async def aencrypt(self, data, key, mode, iv=None, padding=True):
+        """
+        Encryption of a message
+        - input: (bytes) data, (bytes or AES object) key, (str) mode in MODES, (bytes) iv, (bool) padding
+        - output: (bytes) ciphertext
+        """
+        return await self.run(len(data), _crypt, Encryptor, data, key, mode, iv, padding)
+
+    async def adecrypt(self, data, key, mode, iv=None, padding=True):
+        """
+        Decryption of a message
+        - input: (bytes) data, (bytes or AES object) key, (str) mode in MODES, (bytes) iv, (bool) padding
+        - output: (bytes) plaintext
+        """
+        return await self.run(len(data), _crypt, Decryptor, data, key, mode, iv, padding)
+
+    async def _crypt_stream(self, cipher, reader, writer, chunk_size):
+        """
+        Copies reader to writer through cipher. drain() suspends the copy while the
+        peer does not read, so at most about one chunk is buffered
+        """
+        total = 0
+        while True:
+            chunk = await reader.read(chunk_size)
+            if not chunk:
+                break
+            out = await self.run(len(chunk), cipher.update, chunk, stateful=True)
+            if out:
+                writer.write(out)
+                total += len(out)
+                await writer.drain()
+        out = cipher.finalize()
+        writer.write(out)
+        await writer.drain()
+        return total + len(out)
+
+    async def encrypt_stream(self, reader, writer, key, mode, iv=None, padding=True, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Encrypts everything read from reader until EOF into writer, writer is not closed
+        - input: (asyncio.StreamReader) reader, (asyncio.StreamWriter) writer, (bytes or AES object) key,
+                 (str) mode, (bytes) iv, (bool) padding, (int) chunk_size
+        - output: (int) number of bytes written
+        """
+        return await self._crypt_stream(Encryptor(mode, key, iv, padding), reader, writer, chunk_size)
+
+    async def decrypt_stream(self, reader, writer, key, mode, iv=None, padding=True, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Decrypts everything read from reader until EOF into writer, writer is not closed
+        - input: (asyncio.StreamReader) reader, (asyncio.StreamWriter) writer, (bytes or AES object) key,
+                 (str) mode, (bytes) iv, (bool) padding, (int) chunk_size
+        - output: (int) number of bytes written
+        """
+        return await self._crypt_stream(Decryptor(mode, key, iv, padding), reader, writer, chunk_size)
+
+# Used by the module-level functions
+default_offloader = Offloader()
+
+async def aencrypt(data, key, mode, iv=None, padding=True):
+    """
+    Encryption of a message with default_offloader
+    - input: (bytes) data, (bytes or AES object) key, (str) mode, (bytes) iv, (bool) padding
+    - output: (bytes) ciphertext
+    """
+    return await default_offloader.aencrypt(data, key, mode, iv, padding)
+
+async def adecrypt(data, key, mode, iv=None, padding=True):
+    """
+    Decryption of a message with default_offloader
+    - input: (bytes) data, (bytes or AES object) key, (str) mode, (bytes) iv, (bool) padding
+    - output: (bytes) plaintext
+    """
+    return await default_offloader.adecrypt(data, key, mode, iv, padding)
+
+async def encrypt_stream(reader, writer, key, mode, iv=None, padding=True, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Encrypts a stream with default_offloader, see Offloader.encrypt_stream
+    """
+    return await default_offloader.encrypt_stream(reader, writer, key, mode, iv, padding, chunk_size)
+
+async def decrypt_stream(reader, writer, key, mode, iv=None, padding=True, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Decrypts a stream with default_offloader, see Offloader.decrypt_stream
+    """
+    return await default_offloader.decrypt_stream(reader, writer, key, mode, iv, padding, chunk_size)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Benchmarks of the AES primitives, key expansion and Enc/Dec throughput.
+           Usage: python benchmark.py [--suite NAME ...] [--json FILE]
+"""
+
+#-- Import --#
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from aes_functions import *
+from cipher import AES
+from modes import ecb_encrypt, cbc_encrypt, ctr_encrypt
+from gcm import gcm_encrypt
+from cmac import CMACKey
+#- End Import -#
+
+KEYS = {128: bytes(range(16)), 192: bytes(range(24)), 256: bytes(range(32))}
+
+# Backends too slow for the bulk suite at full size
+SLOW_BACKENDS = ("bytematrix", "flat")
+
+# Modules of the import suite and the import time allowed to each, in seconds
+IMPORT_BUDGET = {"byte": 0.002, "aes_functions": 0.01, "cipher": 0.01, "modes": 0.01}
+
+def measure(func, number, repeat, warmup):
+    """
+    Times func, number calls per repetition
+    - input: (function) func without argument, (int) number, (int) repeat, (int) warmup calls
+    - output: (list of float) seconds per call for each repetition
+    """
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return times
+
+def summarize(name, times, number, nbytes=None, **params):
+    """
+    Statistical summary of a benchmark
+    - input: (str) name, (list of float) times, (int) number, (int) nbytes processed per call,
+             (dict) params describing the case
+    - output: (dict) result
+    """
+    result = {"name": name, "params": params, "number": number, "repeat": len(times),
+              "min_s": min(times), "mean_s": statistics.mean(times),
+              "median_s": statistics.median(times),
+              "stdev_s": statistics.stdev(times) if (len(times) > 1) else 0.0}
+    if nbytes:
+        best = min(times)
+        result["blocks_per_s"] = nbytes / 16 / best
+        result["MB_per_s"] = nbytes / best / 1e6
+    return result
+
+def run(name, func, cfg, number=None, nbytes=None, **params):
+    """
+    Measures and summarizes a case with the settings of cfg
+    """
+    number = number or cfg.number
+    return summarize(name, measure(func, number, cfg.repeat, cfg.warmup), number, nbytes, **params)
+
+def suite_primitives(cfg):
+    """
+    Byte and ByteMatrix arithmetic and the round functions
+    """
+    results = []
+    a, b = Byte(0x57), Byte(0x83)
+    results.append(run("Byte.__mul__", lambda: a * b, cfg, number=100*cfg.number))
+    state = bytes2ByteMatrix(bytes(range(16)))
+    results.append(run("ByteMatrix.__mul__", lambda: MixColumns_mat * state, cfg))
+    round_key = KeyExpansion(KEYS[128])[1]
+    for flat in (False, True):
+        state = bytes2ByteMatrix(bytes(range(16)), flat=flat)
+        for func in (SubBytes, ShiftRows, MixColumns, InvSubBytes, InvShiftRows, InvMixColumns):
+            results.append(run(func.__name__, lambda: func(state), cfg, flat=flat))
+        results.append(run("AddRoundKey", lambda: AddRoundKey(state, round_key), cfg, flat=flat))
+    return results
+
+def suite_key_expansion(cfg):
+    """
+    KeyExpansion and the ttable key expansion per key size
+    """
+    results = []
+    for size, key in KEYS.items():
+        results.append(run("KeyExpansion", lambda: KeyExpansion(key), cfg, key_size=size))
+        results.append(run("ttable.expand_key", lambda: ttable.expand_key(key), cfg, key_size=size))
+    return results
+
+def suite_key_batch(cfg):
+    """
+    Expansion of many keys, one by one and with numpy_backend.expand_keys
+    """
+    results = []
+    for size in KEYS:
+        keys = [os.urandom(size // 8) for _ in range(cfg.batch_keys)]
+        results.append(run("KeyExpansion", lambda: [KeyExpansion(key) for key in keys], cfg, number=1,
+                           key_size=size, keys=cfg.batch_keys))
+        results.append(run("ttable.expand_key", lambda: [ttable.expand_key(key) for key in keys], cfg,
+                           number=1, key_size=size, keys=cfg.batch_keys))
+        results.append(run("expand_keys", lambda: numpy_backend.expand_keys(keys), cfg, number=1,
+                           key_size=size, keys=cfg.batch_keys, numpy=numpy_backend.HAVE_NUMPY))
+    return results
+
+def import_time(module):
+    """
+    Cumulative import time of a module in a fresh interpreter, as reported by -X importtime.
+    Bytecode is cached, as it is once installed
+    - input: (str) module
+    - output: (float) seconds
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                          cwd=os.path.dirname(os.path.abspath(__file__)), env=env, capture_output=True,
+                          text=True, check=True)
+    for line in proc.stderr.splitlines():
+        fields = line.split('|')
+        if (len(fields) == 3) and (fields[2].strip() == module):
+            return int(fields[1]) / 1e6
+    raise RuntimeError("No import time reported for {}.".format(module))
+
+def suite_import(cfg):
+    """
+    Import time of the entry modules against IMPORT_BUDGET, tables and NumPy are loaded lazily
+    """
+    results = []
+    for module, budget in IMPORT_BUDGET.items():
+        import_time(module)
+        result = summarize("import", [import_time(module) for _ in range(cfg.repeat)], 1, module=module)
+        result["budget_s"] = budget
+        result["within_budget"] = result["median_s"] <= budget
+        results.append(result)
+    return results
+
+def suite_blocks(cfg):
+    """
+    Single-block Enc/Dec per backend and key size, schedules are served by schedule_cache
+    """
+    results = []
+    block = bytes(range(16))
+    for backend in cfg.backends:
+        for size, key in KEYS.items():
+            results.append(run("Enc", lambda: Enc(block, key, backend), cfg, nbytes=16,
+                               backend=backend, key_size=size))
+            results.append(run("Dec", lambda: Dec(block, key, backend), cfg, nbytes=16,
+                               backend=backend, key_size=size))
+    return results
+
+def suite_bulk(cfg):
+    """
+    Bulk encryption and decryption of independent blocks with a cipher object
+    """
+    results = []
+    for backend in cfg.backends:
+        nbytes = cfg.bulk_bytes // 64 if (backend in SLOW_BACKENDS) else cfg.bulk_bytes
+        nbytes -= nbytes % 16
+        data = os.urandom(nbytes)
+        for size, key in KEYS.items():
+            cipher = AES(key, backend)
+            results.append(run("AES.encrypt_blocks", lambda: cipher.encrypt_blocks(data), cfg, number=1,
+                               nbytes=nbytes, backend=backend, key_size=size))
+            results.append(run("AES.decrypt_blocks", lambda: cipher.decrypt_blocks(data), cfg, number=1,
+                               nbytes=nbytes, backend=backend, key_size=size))
+    return results
+
+def suite_modes(cfg):
+    """
+    Throughput of the modes of operation, GCM and CMAC with a cipher object. CMAC is
+    measured on the whole data and on 64-byte messages verified as a batch
+    """
+    results = []
+    iv = bytes(range(16))
+    for backend in cfg.backends:
+        nbytes = cfg.bulk_bytes // 64 if (backend in SLOW_BACKENDS) else cfg.bulk_bytes
+        nbytes -= nbytes % 16
+        data = os.urandom(nbytes)
+        cipher = AES(KEYS[128], backend)
+        cmac_key = CMACKey(cipher)
+        messages = [data[k:k+64] for k in range(0, nbytes, 64)]
+        cases = (("ecb_encrypt", lambda: ecb_encrypt(data, cipher, padding=False)),
+                 ("cbc_encrypt", lambda: cbc_encrypt(data, cipher, iv, padding=False)),
+                 ("ctr_encrypt", lambda: ctr_encrypt(data, cipher, iv)),
+                 ("gcm_encrypt", lambda: gcm_encrypt(data, cipher, iv[:12], b'header')),
+                 ("cmac", lambda: cmac_key.mac(data)),
+                 ("cmac.mac_batch", lambda: cmac_key.mac_batch(messages)))
+        for name, func in cases:
+            results.append(run(name, func, cfg, number=1, nbytes=nbytes, backend=backend, key_size=128))
+    return results
+
+SUITES = {"primitives": suite_primitives, "key_expansion": suite_key_expansion,
+          "key_batch": suite_key_batch, "blocks": suite_blocks, "bulk": suite_bulk,
+          "modes": suite_modes, "import": suite_import}
+
+def format_result(result):
+    """
+    One line of the text report
+    - input: (dict) result
+    - output: (str) no name
+    """
+    params = ' '.join("{}={}".format(k, v) for k, v in result["params"].items())
+    line = "{:<22} {:<32} median {:>10.2f} us  stdev {:>8.2f} us".format(
+        result["name"], params, 1e6*result["median_s"], 1e6*result["stdev_s"])
+    if "budget_s" in result:
+        line += "  budget {:>8.2f} us {}".format(1e6*result["budget_s"], "ok" if result["within_budget"] else "EXCEEDED")
+    if "MB_per_s" in result:
+        line += "  {:>10.0f} blocks/s  {:>7.2f} MB/s".format(result["blocks_per_s"], result["MB_per_s"])
+    return line
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the AES implementation.")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="suite to run, can be repeated (default: all)")
+    parser.add_argument("--backend", action="append", dest="backends", choices=BACKENDS,
+                        help="backend to benchmark, can be repeated (default: all)")
+    parser.add_argument("--number", type=int, default=50, help="calls per repetition")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions")
+    parser.add_argument("--warmup", type=int, default=5, help="warmup calls")
+    parser.add_argument("--bulk-bytes", type=int, default=1 << 20, help="bytes of the bulk suite")
+    parser.add_argument("--batch-keys", type=int, default=1000, help="keys of the key_batch suite")
+    parser.add_argument("--json", metavar="FILE", help="write the results as JSON ('-' for stdout)")
+    cfg = parser.parse_args(argv)
+    cfg.backends = cfg.backends or list(BACKENDS)
+
+    results = []
+    for name in (cfg.suite or list(SUITES)):
+        for result in SUITES[name](cfg):
+            result["suite"] = name
+            results.append(result)
+            if cfg.json != "-":
+                print(format_result(result))
+
+    if cfg.json:
+        report = {"python": sys.version, "platform": platform.platform(), "time": time.time(),
+                  "settings": {"number": cfg.number, "repeat": cfg.repeat, "warmup": cfg.warmup,
+                               "bulk_bytes": cfg.bulk_bytes, "batch_keys": cfg.batch_keys, "backends": cfg.backends},
+                  "results": results}
+        if cfg.json == "-":
+            json.dump(report, sys.stdout, indent=2)
+        else:
+            with open(cfg.json, "w") as f:
+                json.dump(report, f, indent=2)
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Bit-sliced engine for AES Cipher. Bit k of every byte of a batch of blocks
+           is held in one Python int, one lane per byte, 8 bits apart. The S-box is
+           computed as a Boolean circuit (inversion in F_256, then the affine map),
+           ShiftRows and MixColumns as masks and shifts: no table is indexed with
+           secret data and the cost of a round does not depend on the data.
+           Python ints are not constant-time primitives, the engine only removes the
+           data-dependent memory accesses.
+"""
+
+#-- Import --#
+import functools
+from constants import *
+#- End Import -#
+
+# Blocks processed together, the ints of a batch are 16*BATCH_BLOCKS bytes long
+BATCH_BLOCKS = 1024
+
+@functools.lru_cache(maxsize=32)
+def _lanes(nbytes):
+    """
+    Mask of the lowest bit of each of nbytes bytes
+    """
+    return int.from_bytes(b'\x01'*nbytes, 'little')
+
+@functools.lru_cache(maxsize=32)
+def _masks(nbytes):
+    """
+    Lane masks of a batch of blocks, selecting bytes by row r = p%4 and column c = p//4
+    of their position p in the block
+    - input: (int) nbytes, multiple of 16
+    - output: (tuple) lanes, row0, rot {n: (low, high)}, shift {r: (no wrap, wrap)}, inv_shift {r: (no wrap, wrap)}
+    """
+    def mask(cond):
+        return int.from_bytes(bytes([1 if cond(p) else 0 for p in range(16)]) * (nbytes // 16), 'little')
+    rot = {n: (mask(lambda p: p%4 < 4 - n), mask(lambda p: p%4 >= 4 - n)) for n in (1, 2)}
+    shift = {r: (mask(lambda p: (p%4 == r) and (p//4 < 4 - r)), mask(lambda p: (p%4 == r) and (p//4 >= 4 - r)))
+             for r in (1, 2, 3)}
+    inv_shift = {r: (mask(lambda p: (p%4 == r) and (p//4 >= r)), mask(lambda p: (p%4 == r) and (p//4 < r)))
+                 for r in (1, 2, 3)}
+    return _lanes(nbytes), mask(lambda p: p%4 == 0), rot, shift, inv_shift
+
+def _slice(data):
+    """
+    Bit slices of bytes
+    - input: (bytes) data
+    - output: (list of 8 int) slices, bit 8*b of slice k is bit k of byte b
+    """
+    x = int.from_bytes(data, 'little')
+    lanes = _lanes(len(data))
+    return [(x >> k) & lanes for k in range(8)]
+
+def _unslice(s, nbytes):
+    """
+    Bytes of bit slices
+    - input: (list of 8 int) slices, (int) nbytes
+    - output: (bytes) data
+    """
+    x = 0
+    for k in range(8):
+        x |= s[k] << k
+    return x.to_bytes(nbytes, 'little')
+
+#-- Arithmetic of F_256 on slices --#
+
+def _reduce(c):
+    """
+    Reduction of a polynomial of degree 14 modulo x^8 + x^4 + x^3 + x + 1
+    """
+    for k in range(14, 7, -1):
+        t = c[k]
+        c[k-4] ^= t
+        c[k-5] ^= t
+        c[k-7] ^= t
+        c[k-8] ^= t
+    return c[:8]
+
+def _mul(a, b):
+    c = [0]*15
+    for i in range(8):
+        ai = a[i]
+        for j in range(8):
+            c[i+j] ^= ai & b[j]
+    return _reduce(c)
+
+def _square(a):
+    c = [0]*15
+    for i in range(8):
+        c[2*i] = a[i]
+    return _reduce(c)
+
+def _inverse(a):
+    """
+    a^254, the inverse of a in F_256 and 0 for 0, with 4 multiplications
+    """
+    a2 = _square(a)
+    a3 = _mul(a2, a)
+    a12 = _square(_square(a3))
+    a15 = _mul(a12, a3)
+    a240 = _square(_square(_square(_square(a15))))
+    return _mul(_mul(a240, a12), a2)
+
+def _xtime(a):
+    """
+    Multiplication by {02}
+    """
+    return [a[7], a[0] ^ a[7], a[1], a[2] ^ a[7], a[3] ^ a[7], a[4], a[5], a[6]]
+
+#- End Arithmetic -#
+
+#-- Round functions on slices --#
+
+def _sub_bytes(s, lanes):
+    a = _inverse(s)
+    # Affine map, the constant 0x63 flips the lanes of bits 0, 1, 5, 6
+    return [a[i] ^ a[(i+4)%8] ^ a[(i+5)%8] ^ a[(i+6)%8] ^ a[(i+7)%8] ^ (lanes if ((0x63 >> i) & 1) else 0)
+            for i in range(8)]
+
+def _inv_sub_bytes(s, lanes):
+    # Inverse affine map, constant 0x05
+    a = [s[(i+2)%8] ^ s[(i+5)%8] ^ s[(i+7)%8] ^ (lanes if ((0x05 >> i) & 1) else 0) for i in range(8)]
+    return _inverse(a)
+
+def _shift_rows(s, masks):
+    # The byte at (r, c) comes from (r, c+r), 4*r positions further or 16-4*r before when wrapping
+    row0, shift = masks[1], masks[3]
+    out = []
+    for x in s:
+        y = x & row0
+        for r in (1, 2, 3):
+            y |= ((x >> 32*r) & shift[r][0]) | ((x << 8*(16 - 4*r)) & shift[r][1])
+        out.append(y)
+    return out
+
+def _inv_shift_rows(s, masks):
+    row0, inv_shift = masks[1], masks[4]
+    out = []
+    for x in s:
+        y = x & row0
+        for r in (1, 2, 3):
+            y |= ((x << 32*r) & inv_shift[r][0]) | ((x >> 8*(16 - 4*r)) & inv_shift[r][1])
+        out.append(y)
+    return out
+
+def _rot(s, n, masks):
+    """
+    Row r of each column takes the value of row r+n (mod 4)
+    """
+    low, high = masks[2][n]
+    return [((x >> 8*n) & low) | ((x << 8*(4 - n)) & high) for x in s]
+
+def _mix_columns(s, masks):
+    # 2*a_r + 3*a_r+1 + a_r+2 + a_r+3 = xtime(t_r) + a_r+1 + t_r+2 with t_r = a_r + a_r+1
+    r1 = _rot(s, 1, masks)
+    t = [x ^ y for x, y in zip(s, r1)]
+    return [x ^ y ^ z for x, y, z in zip(_xtime(t), r1, _rot(t, 2, masks))]
+
+def _inv_mix_columns(s, masks):
+    # InvMixColumns is MixColumns after a_r <- a_r + {04}*(a_r + a_r+2)
+    u = _xtime(_xtime([x ^ y for x, y in zip(s, _rot(s, 2, masks))]))
+    return _mix_columns([x ^ y for x, y in zip(s, u)], masks)
+
+def _add_round_key(s, k):
+    return [x ^ y for x, y in zip(s, k)]
+
+#- End Round functions -#
+
+def expand_key(key):
+    """
+    KeyExpansion algorithm with SubWord computed on slices
+    - input: (bytes, 16/24/32 B) key
+    - output: (bytearray) rk, the Nr+1 round keys as blocks, mutable so that key_cache can zeroize it
+    """
+    try:
+        assert len(key) in (16, 24, 32)
+    except AssertionError:
+        raise ValueError("Key should be 16, 24 or 32 bytes.")
+    Nk = len(key) // 4
+    Nr = 10 + (Nk - 4)
+    lanes = _lanes(4)
+    sub_word = lambda w: int.from_bytes(_unslice(_sub_bytes(_slice(w.to_bytes(4, 'big')), lanes), 4), 'big')
+
+    words = [int.from_bytes(key[4*j:4*(j+1)], 'big') for j in range(Nk)]
+    for j in range(Nk, 4*(Nr+1)):
+        tmp = words[j-1]
+        if (j%Nk == 0):
+            tmp = sub_word(((tmp << 8) & 0xffffffff) | (tmp >> 24)) ^ (Rcon[0, j // Nk - 1].byte << 24)
+        elif (Nk > 6) and (j%Nk == 4):
+            tmp = sub_word(tmp)
+        words.append(words[j-Nk] ^ tmp)
+    return bytearray(b''.join([w.to_bytes(4, 'big') for w in words]))
+
+def _crypt_batch(data, rk, decrypt):
+    """
+    Encrypts or decrypts the blocks of a batch at once
+    - input: (bytes, multiple of 16 B) data, (bytearray) rk, (bool) decrypt
+    - output: (bytes) no name
+    """
+    nbytes = len(data)
+    masks = _masks(nbytes)
+    lanes = masks[0]
+    Nr = len(rk) // 16 - 1
+    # Round keys repeated over the blocks
+    keys = [_slice(rk[16*i:16*(i+1)] * (nbytes // 16)) for i in range(Nr+1)]
+
+    s = _slice(data)
+    if not decrypt:
+        s = _add_round_key(s, keys[0])
+        for i in range(1, Nr):
+            s = _add_round_key(_mix_columns(_shift_rows(_sub_bytes(s, lanes), masks), masks), keys[i])
+        s = _add_round_key(_shift_rows(_sub_bytes(s, lanes), masks), keys[Nr])
+    else:
+        s = _add_round_key(s, keys[Nr])
+        for i in range(Nr-1, 0, -1):
+            s = _inv_mix_columns(_add_round_key(_inv_sub_bytes(_inv_shift_rows(s, masks), lanes), keys[i]), masks)
+        s = _add_round_key(_inv_sub_bytes(_inv_shift_rows(s, masks), lanes), keys[0])
+    return _unslice(s, nbytes)
+
+def _crypt_blocks_into(data, out, offset, rk, decrypt):
+    """
+    Processes the blocks of data by batches and writes them at an offset of out
+    """
+    try:
+        assert len(data) % 16 == 0
+    except AssertionError:
+        raise ValueError("Data should be a multiple of 16 bytes. Padding is not handled.")
+    src = memoryview(data).cast('B')
+    dst = memoryview(out).cast('B')
+    step = 16*BATCH_BLOCKS
+    for k in range(0, len(src), step):
+        batch = bytes(src[k:k+step])
+        dst[offset+k:offset+k+len(batch)] = _crypt_batch(batch, rk, decrypt)
+    return len(src)
+
+def encrypt_blocks_into(data, out, offset, rk):
+    """
+    Encrypts independent blocks (ECB) into a writable buffer at an offset
+    - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset, (bytearray) rk from expand_key
+    - output: (int) number of bytes written
+    """
+    return _crypt_blocks_into(data, out, offset, rk, False)
+
+def decrypt_blocks_into(data, out, offset, rk):
+    """
+    Decrypts independent blocks (ECB) into a writable buffer at an offset
+    - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset, (bytearray) rk from expand_key
+    - output: (int) number of bytes written
+    """
+    return _crypt_blocks_into(data, out, offset, rk, True)
+
+def encrypt_blocks(data, rk):
+    """
+    Encrypts independent blocks (ECB), the batch width grows with the data
+    - input: (buffer, multiple of 16 B) data, (bytearray) rk from expand_key
+    - output: (bytes) ciphertexts
+    """
+    out = bytearray(len(data))
+    _crypt_blocks_into(data, out, 0, rk, False)
+    return bytes(out)
+
+def decrypt_blocks(data, rk):
+    """
+    Decrypts independent blocks (ECB), the batch width grows with the data
+    - input: (buffer, multiple of 16 B) data, (bytearray) rk from expand_key
+    - output: (bytes) plaintexts
+    """
+    out = bytearray(len(data))
+    _crypt_blocks_into(data, out, 0, rk, True)
+    return bytes(out)
+
+def encrypt_block(block, rk):
+    """
+    AES cipher on a single block, a batch of width 1
+    - input: (bytes, 16 B) block, (bytearray) rk from expand_key
+    - output: (bytes, 16 B) ciphertext
+    """
+    check_block(block)
+    return _crypt_batch(bytes(block), rk, False)
+
+def decrypt_block(block, rk):
+    """
+    AES inverse cipher on a single block, a batch of width 1
+    - input: (bytes, 16 B) block, (bytearray) rk from expand_key
+    - output: (bytes, 16 B) plaintext
+    """
+    check_block(block)
+    return _crypt_batch(bytes(block), rk, True)
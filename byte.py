@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
     Created: 10/10/2020
-    Last modification: 10/11/2020
+    Last modification: 10/18/2026
 
     @creator: coconutj
 
@@ -9,25 +9,59 @@
 """
 
 #-- Import --#
-import functools
+import os
 #- End Import -#
 
+# Name of the environment variable disabling the checks of ByteMatrix(), AES_VALIDATE=0
+VALIDATE_ENV_VAR = "AES_VALIDATE"
+# Checks of the elements and row lengths given to ByteMatrix(). Matrices computed from
+# other matrices (operators, indexing, copies, conversions) never go through them
+VALIDATE = os.environ.get(VALIDATE_ENV_VAR, "1") != "0"
+
+def set_validation(enabled):
+    """
+    Enables or disables the checks of ByteMatrix(), they should stay enabled in tests
+    - input: (bool) enabled
+    - output: None
+    """
+    global VALIDATE
+    VALIDATE = bool(enabled)
+
+def _build_gf_tables():
+    """
+    Builds the antilog and log tables of F_256 for the generator x+1 ({03})
+    - output: (list of 510 int) exp, (list of 256 int) log
+    """
+    exp, log = [0]*510, [0]*256
+    a = 1
+    for k in range(255):
+        exp[k] = exp[k+255] = a
+        log[a] = k
+        # a <- a * {03} = xtime(a) + a
+        a ^= ((a << 1) ^ 0x11b) if (a > 127) else (a << 1)
+    return exp, log
+
+# exp is doubled so that exp[log[a] + log[b]] needs no reduction mod 255
+GF_exp, GF_log = _build_gf_tables()
+
 class Byte:
     """
-    Object of a byte as a field element of F_256
-    - attributes : (int) byte
-    - methods : *init, *repr, *str, *eq, *ne, *add, *radd, *iadd, *mul, *rmul, *imul
+    Object of a byte as a field element of F_256, immutable and interned:
+    the 256 possible values are shared instances
+    - attributes : (int) byte, read-only
+    - methods : *new, *repr, *str, *eq, *ne, *hash, *setattr, *reduce, *add, *radd, *iadd, *mul, *rmul, *imul, inverse
     """
+    __slots__ = ("byte",)
 
-    def __init__(self, byte=0):
+    def __new__(cls, byte=0):
         """
-        Default byte 0x00
+        Default byte 0x00, returns the shared instance of the value
         """
-        try:
-            assert type(byte) == int
-            self.byte = byte
-        except AssertionError:
+        if type(byte) != int:
             raise TypeError("Input not of type Bytes")
+        if not (0 <= byte <= 255):
+            raise ValueError("Byte value must be between 0x00 and 0xff")
+        return _BYTES[byte]
 
     def __repr__(self):
         """
@@ -80,13 +114,32 @@ class Byte:
         """
         return not(self == oth_byte)
 
+    def __hash__(self):
+        """
+        Bytes can be used as dictionary keys
+        - output: (int) no name
+        """
+        return self.byte
+
+    def __setattr__(self, name, value):
+        """
+        Bytes are shared, hence read-only
+        """
+        raise AttributeError("Byte objects are immutable")
+
+    def __reduce__(self):
+        """
+        Unpickling returns the shared instance
+        """
+        return (Byte, (self.byte,))
+
     def __add__(self, oth_byte):
         """
         Overload of the + operator for two Byte objects
         - input: (Byte object) oth_byte
         - output: (Byte object) no_name
         """
-        return Byte(self.byte ^ oth_byte.byte)
+        return _BYTES[self.byte ^ oth_byte.byte]
 
     def __radd__(self, oth_byte):
         """
@@ -110,16 +163,10 @@ class Byte:
         - input: (Byte object) oth_byte
         - output: (Byte object) no_name
         """
-        # mul_x = lambda a: (a << 1) if (a <= 127) else ((a << 1) ^ 0x11b)
-        # mul_xk = lambda a, k: a if (k == 0) else mul_xk(mul_x(a), k-1)
-        mul_xk = lambda a, k: a if (k == 0) else mul_xk((a << 1) if (a <= 127) else ((a << 1) ^ 0x11b), k-1)
-
-        lis = [mul_xk(self.byte, k) for k, bit in enumerate(bin(oth_byte.byte)[2:][::-1]) if bit == '1']
-
-        if lis == []:
-            return Byte()
-        else:
-            return Byte(functools.reduce(lambda a,b: a ^ b, lis))
+        a, b = self.byte, oth_byte.byte
+        if (a == 0) or (b == 0):
+            return _BYTES[0]
+        return _BYTES[GF_exp[GF_log[a] + GF_log[b]]]
 
     def __rmul__(self, oth_byte):
         """
@@ -137,12 +184,35 @@ class Byte:
         """
         return self * oth_byte
 
+    def inverse(self):
+        """
+        Multiplicative inverse in F_256, {00} is mapped to {00} as in the S-box
+        - output: (Byte object) no name
+        """
+        if self.byte == 0:
+            return _BYTES[0]
+        return _BYTES[GF_exp[255 - GF_log[self.byte]]]
+
+def _intern_bytes():
+    """
+    Allocates the 256 shared Byte instances
+    - output: (tuple of 256 Byte objects) no name
+    """
+    table = []
+    for k in range(256):
+        byte = object.__new__(Byte)
+        object.__setattr__(byte, "byte", k)
+        table.append(byte)
+    return tuple(table)
+
+_BYTES = _intern_bytes()
+
 
 class ByteMatrix:
     """
     Matrix of Byte objects
     - attributes : (list of lists of Bytes) arr, (int) m, (int) n, (tuple) shape
-    - methods : *init, *repr, *str, *eq, *ne, *add, *radd, *iadd, *mul, *imul, shape, *lshift, *rshift, *getitem, *setitem
+    - methods : *init, *repr, *str, *eq, *ne, *add, *radd, *iadd, *mul, *imul, shape, copy, *lshift, *rshift, *getitem, *setitem
     """
 
     def __init__(self, arr, m=None, n=None):
@@ -151,7 +221,9 @@ class ByteMatrix:
             assert (len(arr) != 0)
 
             # Single list is given, input parameters m, n are used to reshape the list
-            if all(map(lambda elt: type(elt) == Byte, arr)):
+            if type(arr[0]) != list:
+                if VALIDATE:
+                    assert all(map(lambda elt: type(elt) == Byte, arr))
                 # Construct a row because row number not specified
                 if (m is None):
                     self.arr = [arr]
@@ -169,22 +241,36 @@ class ByteMatrix:
                     self.m = m
                     self.n = n
             # List of lists is given
-            elif all(map(lambda elt: type(elt) == list, arr)):
-                # Verifying that all elements are of type Byte
-                assert all([all(map(lambda elt: type(elt) == Byte, arr[k])) for k in range(len(arr))])
-                # Verifying that all rows have the same number of elements
-                len_lis = [len(arr[k]) for k in range(len(arr))]
-                assert min(len_lis) == max(len_lis) 
+            else:
+                if VALIDATE:
+                    assert all(map(lambda elt: type(elt) == list, arr))
+                    # Verifying that all elements are of type Byte
+                    assert all([all(map(lambda elt: type(elt) == Byte, arr[k])) for k in range(len(arr))])
+                    # Verifying that all rows have the same number of elements
+                    len_lis = [len(arr[k]) for k in range(len(arr))]
+                    assert min(len_lis) == max(len_lis) 
 
                 self.m = len(arr)
                 self.n = len(arr[0])
                 self.arr = arr
-            else:
-                assert 0 == 1
             self.shape = (self.m, self.n)
         except AssertionError:
         	raise TypeError("Given parameters are not valid.")
 
+    @classmethod
+    def _trusted(cls, arr, m, n):
+        """
+        Builds a matrix on rows known to be valid, without any check nor copy
+        - input: (list of m lists of n Bytes) arr, (int) m, (int) n
+        - output: (ByteMatrix object) no name
+        """
+        mat = object.__new__(cls)
+        mat.arr = arr
+        mat.m = m
+        mat.n = n
+        mat.shape = (m, n)
+        return mat
+
     def __repr__(self):
         """
         Controls the display in the command prompt
@@ -209,6 +295,8 @@ class ByteMatrix:
         - input: (ByteMatrix object) oth_mat
         - output: (bool) no name
         """
+        if type(oth_mat) != ByteMatrix:
+            return NotImplemented
         return self.arr == oth_mat.arr
 
     def __ne__(self, oth_mat):
@@ -225,12 +313,14 @@ class ByteMatrix:
         - input: (ByteMatrix object) oth_mat
         - output: (ByteMatrix object) no name
         """
+        if type(oth_mat) != ByteMatrix:
+            return NotImplemented
         try:
             assert (self.m == oth_mat.m) and (self.n == oth_mat.n)
             arr = []
             for i in range(self.m):
                 arr.append([self.arr[i][j] + oth_mat.arr[i][j] for j in range(self.n)])
-            return ByteMatrix(arr=arr, m=self.m, n=self.n)
+            return ByteMatrix._trusted(arr, self.m, self.n)
         except AssertionError:
             raise ValueError("Dimensions don't match.")
 
@@ -256,17 +346,20 @@ class ByteMatrix:
         - input: (ByteMatrix object) oth_mat
         - output: (ByteMatrix object) no name
         """
+        if type(oth_mat) != ByteMatrix:
+            return NotImplemented
         try:
             assert (self.n == oth_mat.m)
             arr = []
             for i in range(self.m):
+                row = []
                 for j in range(oth_mat.n):
-                    S = Byte(0)
+                    S = _BYTES[0]
                     for k in range(self.n):
                         S += self.arr[i][k]*oth_mat.arr[k][j]
-                    arr.append(S)
-            # arr is reshaped by the constructor
-            return ByteMatrix(arr=arr, m=self.m, n=oth_mat.n)
+                    row.append(S)
+                arr.append(row)
+            return ByteMatrix._trusted(arr, self.m, oth_mat.n)
         except AssertionError:
             raise ValueError("Dimensions don't match.")
 
@@ -285,6 +378,13 @@ class ByteMatrix:
         """
         return self.m, self.n
 
+    def copy(self):
+        """
+        Returns a copy of the ByteMatrix (Byte objects are shared, they are immutable)
+        - output: (ByteMatrix object) no name
+        """
+        return ByteMatrix._trusted([list(row) for row in self.arr], self.m, self.n)
+
     def __lshift__(self, tup):
     	"""
     	Performs a circular left shift of given row by given step
@@ -325,7 +425,7 @@ class ByteMatrix:
         """
         # Exception are handled by list getitem method
         if type(indices) == int:
-            return ByteMatrix(arr=self.arr[indices], m=1, n=self.n)
+            return ByteMatrix._trusted([list(self.arr[indices])], 1, self.n)
         elif type(indices) == tuple:
             try:
                 assert len(indices) == 2
@@ -335,12 +435,12 @@ class ByteMatrix:
                 if type(indices[1]) == int:
                     return self.arr[indices[0]][indices[1]]
                 elif indices[1] == slice(None, None, None):
-                    return ByteMatrix(arr=self.arr[indices[0]], m=1, n=self.n)
+                    return ByteMatrix._trusted([list(self.arr[indices[0]])], 1, self.n)
                 else:
                     raise NotImplementedError("Slices are not implemented.")
             elif indices[0] == slice(None, None, None):
                 if type(indices[1]) == int:
-                    return ByteMatrix(arr=[self.arr[i][indices[1]] for i in range(self.m)], m=self.m, n=1)
+                    return ByteMatrix._trusted([[self.arr[i][indices[1]]] for i in range(self.m)], self.m, 1)
                 elif indices[1] == slice(None, None, None):
                     return self
                 else:
@@ -410,51 +510,424 @@ class ByteMatrix:
         else:
             raise TypeError("Indices must be integers or slices")
 
-def zeros(dim):
+_MUL_TABLES = {}
+
+def _mul_table(a):
+    """
+    Products of a by every element of F_256, built once per coefficient
+    - input: (int) a
+    - output: (bytes, 256 B) no name
+    """
+    table = _MUL_TABLES.get(a)
+    if table is None:
+        table = _MUL_TABLES[a] = bytes([GF_exp[GF_log[a] + GF_log[b]] if (a and b) else 0 for b in range(256)])
+    return table
+
+def _int_rows(mat):
+    """
+    Values of a ByteMatrix or FlatByteMatrix as a list of lists of int
+    - input: (ByteMatrix or FlatByteMatrix object) mat
+    - output: (list of lists of int) no name
+    """
+    if type(mat) == ByteMatrix:
+        return [[byte.byte for byte in row] for row in mat.arr]
+    elif type(mat) == FlatByteMatrix:
+        # Rows are sliced from the storage, the indices of a valid matrix need no check
+        buf, (rs, cs), n = mat.buf, mat.strides, mat.n
+        return [list(buf[start:start + n*cs:cs]) for start in range(mat.offset, mat.offset + mat.m*rs, rs)]
+    raise TypeError("Operand must be of type ByteMatrix or FlatByteMatrix.")
+
+class FlatByteMatrix:
+    """
+    Matrix of bytes stored in a single bytearray, elements are read as Byte objects.
+    Row and column access returns views sharing the storage of the matrix.
+    - attributes : (bytearray) buf, (int) m, (int) n, (tuple) shape, (int) offset, (tuple) strides
+    - methods : *init, *repr, *str, *eq, *ne, *add, *radd, *iadd, *mul, *rmul, substitute, mix_columns, copy, tobytes, row_bytes,
+                *lshift, *rshift, *getitem, *setitem
+    """
+    __slots__ = ("buf", "m", "n", "shape", "offset", "strides")
+
+    def __init__(self, arr, m=None, n=None):
+        """
+        arr is either a ByteMatrix object, or bytes-like data in row-major order,
+        reshaped as (m, n) (a single row by default). Data is copied.
+        """
+        if type(arr) == ByteMatrix:
+            m, n = arr.m, arr.n
+            buf = bytearray(byte.byte for row in arr.arr for byte in row)
+        else:
+            try:
+                buf = bytearray(arr)
+                assert len(buf) != 0
+                if m is None:
+                    m, n = 1, len(buf)
+                elif n is None:
+                    n = len(buf) // m
+                assert len(buf) == m*n
+            except (AssertionError, TypeError):
+                raise TypeError("Given parameters are not valid.")
+        self._bind(buf, m, n, 0, (n, 1))
+
+    def _bind(self, buf, m, n, offset, strides):
+        self.buf = buf
+        self.m = m
+        self.n = n
+        self.shape = (m, n)
+        self.offset = offset
+        self.strides = strides
+
+    @classmethod
+    def _view(cls, buf, m, n, offset, strides):
+        """
+        Builds a matrix over an existing storage without copying it
+        """
+        view = cls.__new__(cls)
+        view._bind(buf, m, n, offset, strides)
+        return view
+
+    def _index(self, i, j):
+        if not ((0 <= i < self.m) and (0 <= j < self.n)):
+            raise IndexError("Index out of range.")
+        return self.offset + i*self.strides[0] + j*self.strides[1]
+
+    def row_bytes(self, i):
+        """
+        Returns the values of row i
+        - input: (int) i
+        - output: (bytes) no name
+        """
+        start = self._index(i, 0)
+        return bytes(self.buf[start:start + self.n*self.strides[1]:self.strides[1]])
+
+    def tobytes(self):
+        """
+        Returns the values of the matrix in row-major order
+        - output: (bytes) no name
+        """
+        if (self.offset == 0) and (self.strides == (self.n, 1)) and (len(self.buf) == self.m*self.n):
+            return bytes(self.buf)
+        return b''.join(self.row_bytes(i) for i in range(self.m))
+
+    def copy(self):
+        """
+        Returns a copy of the matrix with its own storage
+        - output: (FlatByteMatrix object) no name
+        """
+        return FlatByteMatrix(self.tobytes(), m=self.m, n=self.n)
+
+    def __repr__(self):
+        """
+        Controls the display in the command prompt
+        - output: (str) string
+        """
+        string = "< FlatByteMatrix Object >\n---------------------------\n"
+        for i in range(self.m):
+            string += "[ " + ' '.join(["{%02x}" % b for b in self.row_bytes(i)]) + " ]\n"
+        return string
+
+    def __str__(self):
+        """
+        Controls the display through the print function
+        - output: (str) no name
+        """
+        return repr(self)
+
+    def __eq__(self, oth_mat):
+        """
+        Overload of the == operator, compares values with a ByteMatrix or FlatByteMatrix
+        - input: (ByteMatrix or FlatByteMatrix object) oth_mat
+        - output: (bool) no name
+        """
+        if type(oth_mat) not in (ByteMatrix, FlatByteMatrix):
+            return NotImplemented
+        return (self.shape == (oth_mat.m, oth_mat.n)) and (_int_rows(self) == _int_rows(oth_mat))
+
+    def __ne__(self, oth_mat):
+        """
+        Overload of the != operator
+        - input: (ByteMatrix or FlatByteMatrix object) oth_mat
+        - output: (bool) no name
+        """
+        return not(self == oth_mat)
+
+    def __iadd__(self, oth_mat):
+        """
+        Overload of the += operator, XORs oth_mat into the storage in place
+        - input: (ByteMatrix or FlatByteMatrix object) oth_mat
+        - output: (FlatByteMatrix object) self
+        """
+        try:
+            assert (self.m == oth_mat.m) and (self.n == oth_mat.n)
+        except AssertionError:
+            raise ValueError("Dimensions don't match.")
+        rows = _int_rows(oth_mat)
+        buf, (rs, cs) = self.buf, self.strides
+        for i in range(self.m):
+            base = self.offset + i*rs
+            for j, value in enumerate(rows[i]):
+                buf[base + j*cs] ^= value
+        return self
+
+    def __add__(self, oth_mat):
+        """
+        Overload of the + operator
+        - input: (ByteMatrix or FlatByteMatrix object) oth_mat
+        - output: (FlatByteMatrix object) no name
+        """
+        result = self.copy()
+        result += oth_mat
+        return result
+
+    def __radd__(self, oth_mat):
+        """
+        Overload of the + operator (+ is commutative)
+        - input: (ByteMatrix or FlatByteMatrix object) oth_mat
+        - output: (FlatByteMatrix object) no name
+        """
+        return self + oth_mat
+
+    @staticmethod
+    def _product(left, right):
+        """
+        Matrix product of two lists of lists of int in F_256
+        - output: (bytearray) row-major result
+        """
+        out = bytearray()
+        for row in left:
+            for j in range(len(right[0])):
+                S = 0
+                for k, a in enumerate(row):
+                    b = right[k][j]
+                    if a and b:
+                        S ^= GF_exp[GF_log[a] + GF_log[b]]
+                out.append(S)
+        return out
+
+    def __mul__(self, oth_mat):
+        """
+        Overload of the * operator for two matrices
+        - input: (ByteMatrix or FlatByteMatrix object) oth_mat
+        - output: (FlatByteMatrix object) no name
+        """
+        try:
+            assert (self.n == oth_mat.m)
+        except AssertionError:
+            raise ValueError("Dimensions don't match.")
+        return FlatByteMatrix(self._product(_int_rows(self), _int_rows(oth_mat)), m=self.m, n=oth_mat.n)
+
+    def __rmul__(self, oth_mat):
+        """
+        Overload of the * operator when the left operand is a ByteMatrix
+        - input: (ByteMatrix object) oth_mat
+        - output: (FlatByteMatrix object) no name
+        """
+        try:
+            assert (oth_mat.n == self.m)
+        except AssertionError:
+            raise ValueError("Dimensions don't match.")
+        return FlatByteMatrix(self._product(_int_rows(oth_mat), _int_rows(self)), m=oth_mat.m, n=self.n)
+
+    def substitute(self, box):
+        """
+        Replaces every element b of the matrix by box[b] in place
+        - input: (list of 256 int) box
+        - output: (FlatByteMatrix object) self
+        """
+        buf, (rs, cs) = self.buf, self.strides
+        for i in range(self.m):
+            base = self.offset + i*rs
+            for k in range(base, base + self.n*cs, cs):
+                buf[k] = box[buf[k]]
+        return self
+
+    def mix_columns(self, oth_mat):
+        """
+        Replaces the matrix by oth_mat * self in place, one column at a time, no matrix is allocated
+        - input: (ByteMatrix or FlatByteMatrix object, m x m) oth_mat
+        - output: (FlatByteMatrix object) self
+        """
+        try:
+            assert (oth_mat.m == self.m) and (oth_mat.n == self.m)
+        except AssertionError:
+            raise ValueError("Dimensions don't match.")
+        tables = [[_mul_table(a) for a in row] for row in _int_rows(oth_mat)]
+        buf, (rs, cs) = self.buf, self.strides
+        rows = range(self.m)
+        for j in range(self.n):
+            indices = [self.offset + i*rs + j*cs for i in rows]
+            # The column is read before being overwritten
+            column = [buf[k] for k in indices]
+            for k, row in zip(indices, tables):
+                S = 0
+                for table, b in zip(row, column):
+                    S ^= table[b]
+                buf[k] = S
+        return self
+
+    def _rotate(self, tup, sign):
+        try:
+            assert type(tup) == tuple
+            assert len(tup) == 2
+            row, step = tup
+            assert (type(row) == int) and (type(step) == int)
+            assert (0 <= row < self.m)
+        except AssertionError:
+            raise ValueError("Operand is not valid.")
+        values = self.row_bytes(row)
+        start, cs = self._index(row, 0), self.strides[1]
+        for j in range(self.n):
+            self.buf[start + j*cs] = values[(j + sign*step) % self.n]
+
+    def __lshift__(self, tup):
+        """
+        Performs an in-place circular left shift of given row by given step
+        - input: (tuple) tup = (row, step)
+        """
+        self._rotate(tup, 1)
+
+    def __rshift__(self, tup):
+        """
+        Performs an in-place circular right shift of given row by given step
+        - input: (tuple) tup = (row, step)
+        """
+        self._rotate(tup, -1)
+
+    def _row_view(self, i):
+        return FlatByteMatrix._view(self.buf, 1, self.n, self._index(i, 0), self.strides)
+
+    def _col_view(self, j):
+        return FlatByteMatrix._view(self.buf, self.m, 1, self._index(0, j), self.strides)
+
+    def __getitem__(self, indices):
+        """
+        Overload of the [] operator to get an element or a view of a row or a column
+        - input: (int or tuple) indices
+        - output: (Byte or FlatByteMatrix object) no name
+        """
+        full = slice(None, None, None)
+        if type(indices) == int:
+            return self._row_view(indices)
+        elif type(indices) == tuple:
+            if len(indices) != 2:
+                raise IndexError("Too many indices were given.")
+            i, j = indices
+            if type(i) == int:
+                if type(j) == int:
+                    return _BYTES[self.buf[self._index(i, j)]]
+                elif j == full:
+                    return self._row_view(i)
+            elif i == full:
+                if type(j) == int:
+                    return self._col_view(j)
+                elif j == full:
+                    return self
+            raise NotImplementedError("Slices are not implemented.")
+        else:
+            raise TypeError("Indices must be integers or slices")
+
+    def __setitem__(self, indices, value):
+        """
+        Overload of the [] operator to set an element, a row, a column or the whole matrix
+        - input: (int or tuple) indices, (Byte, ByteMatrix or FlatByteMatrix) value
+        - output: None
+        """
+        if type(indices) == int:
+            indices = (indices, slice(None, None, None))
+        elif type(indices) != tuple:
+            raise TypeError("Indices must be integers or slices")
+        elif len(indices) != 2:
+            raise IndexError("Too many indices were given.")
+        i, j = indices
+        if (type(i) == int) and (type(j) == int):
+            if type(value) != Byte:
+                raise TypeError("Operand must be of type Byte.")
+            self.buf[self._index(i, j)] = value.byte
+            return
+        target = self[i, j]
+        if type(value) not in (ByteMatrix, FlatByteMatrix) or (value.m, value.n) != target.shape:
+            raise TypeError("Operand must be of type ByteMatrix or FlatByteMatrix of size {}x{}.".format(*target.shape))
+        # Values are read before writing, value may be a view on the same storage
+        rows = _int_rows(value)
+        rs, cs = target.strides
+        for k in range(target.m):
+            for l in range(target.n):
+                target.buf[target.offset + k*rs + l*cs] = rows[k][l]
+
+# Matrix types accepted by the AES operations
+MATRIX_TYPES = (ByteMatrix, FlatByteMatrix)
+
+def zeros(dim, flat=False):
     """
     Generates a ByteMatrix of dimension dim filled with 0 Byte objects
-    - input: (tuple) dim
-    - output: (ByteMatrix object) no name
+    - input: (tuple) dim, (bool) flat to get a FlatByteMatrix
+    - output: (ByteMatrix or FlatByteMatrix object) no name
     """
     try:
         assert type(dim) == tuple
         assert len(dim) == 2
         assert (type(dim[0]) == int) and (type(dim[1]) == int)
         m,n = dim
-        return ByteMatrix(arr=[Byte() for i in range(m*n)], m=m, n=n)
+        if flat:
+            return FlatByteMatrix(bytes(m*n), m=m, n=n)
+        if (m <= 0) or (n <= 0):
+            raise TypeError("Given parameters are not valid.")
+        return ByteMatrix._trusted([[_BYTES[0]]*n for i in range(m)], m, n)
     except AssertionError:
         raise ValueError("Dimension must be given as a 2-long tuple of integers")
 
-def bytes2ByteMatrix(block):
+def buffer2ByteMatrix(buf, offset=0, flat=False):
     """
-    Maps a 16-byte block to a 4x4 ByteMatrix object
-    - input: (bytes, 16 B) block
-    - output: (ByteMatrix object) state
+    Maps the 16-byte block at an offset of a buffer (bytes, bytearray, memoryview, mmap...)
+    to a 4x4 ByteMatrix object, the block is read in place
+    - input: (buffer) buf, (int) offset, (bool) flat to get a FlatByteMatrix
+    - output: (ByteMatrix or FlatByteMatrix object) state
     """
+    view = memoryview(buf).cast('B')
     try:
         # Padding not handled here
-        assert len(block) == 16
-        state = zeros((4,4))
-        for j in range(4):
-            for i in range(4):
-                state[i,j] = Byte(block[4*j + i])
-        return state
+        assert 0 <= offset <= len(view) - 16
     except AssertionError:
         raise ValueError("Block should be 16 bytes. Padding is not handled.")
+    # Row i of the state is every fourth byte of the column-major block
+    rows = [view[offset+i:offset+16:4] for i in range(4)]
+    if flat:
+        return FlatByteMatrix(b''.join([row.tobytes() for row in rows]), m=4, n=4)
+    return ByteMatrix._trusted([[_BYTES[value] for value in row] for row in rows], 4, 4)
+
+def ByteMatrix2buffer(state, out, offset=0):
+    """
+    Writes a 4x4 ByteMatrix object as a 16-byte block at an offset of a writable buffer
+    - input: (ByteMatrix or FlatByteMatrix object) state, (writable buffer) out, (int) offset
+    - output: None
+    """
+    try:
+        assert type(state) in MATRIX_TYPES
+        assert (state.m == 4) and (state.n == 4)
+    except AssertionError:
+        raise ValueError("Argument must be of type ByteMatrix of size 4x4.")
+    rows = _int_rows(state)
+    memoryview(out).cast('B')[offset:offset+16] = bytes([rows[i][j] for j in range(4) for i in range(4)])
+
+def bytes2ByteMatrix(block, flat=False):
+    """
+    Maps a 16-byte block to a 4x4 ByteMatrix object
+    - input: (bytes-like, 16 B) block, (bool) flat to get a FlatByteMatrix
+    - output: (ByteMatrix or FlatByteMatrix object) state
+    """
+    if len(block) != 16:
+        raise ValueError("Block should be 16 bytes. Padding is not handled.")
+    return buffer2ByteMatrix(block, 0, flat)
 
 def ByteMatrix2bytes(state):
     """
     Maps a 4x4 ByteMatrix object to a 16-byte block
-    - input: (ByteMatrix object) state
+    - input: (ByteMatrix or FlatByteMatrix object) state
     - output: (bytes, 16 B) block
     """
     try:
-        assert type(state) == ByteMatrix
+        assert type(state) in MATRIX_TYPES
         assert (state.m == 4) and (state.n == 4)
-        block = b''
-        for j in range(4):
-            for i in range(4):
-                block += bytes([state[i,j].byte])
-        return block
     except AssertionError:
-        raise ValueError("Argument must be of type ByteMatrix of size 4x4.")
\ No newline at end of file
+        raise ValueError("Argument must be of type ByteMatrix of size 4x4.")
+    rows = _int_rows(state)
+    return bytes([rows[i][j] for j in range(4) for i in range(4)])
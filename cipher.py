@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: AES Cipher object holding an expanded key
+"""
+
+#-- Import --#
+from aes_functions import *
+import schedule_io
+#- End Import -#
+
+class AES:
+    """
+    AES cipher for a fixed key, the key schedules are computed once at construction
+    - attributes : (str) backend, (int) Nr
+    - methods : *init, *repr, from_schedule, from_schedules, dump_schedule, encrypt_block, decrypt_block,
+                encrypt_into, decrypt_into, encrypt_blocks, decrypt_blocks, encrypt_blocks_into,
+                decrypt_blocks_into
+    """
+
+    def __init__(self, key, backend="ttable"):
+        """
+        Expands the key for the cipher and the equivalent inverse cipher
+        - input: (bytes) key, (str) backend in BACKENDS
+        """
+        if backend in ("ttable", "numpy", "compiled"):
+            self._set_words(ttable.expand_key(PadKey(key)), backend)
+        elif backend in ("bytematrix", "flat"):
+            self._set_round_keys(KeyExpansion(key, listed=True, flat=(backend == "flat")), backend)
+        elif backend == "bitslice":
+            self._set_bitslice(bitslice.expand_key(PadKey(key)))
+        else:
+            raise ValueError("Unknown backend, must be one of {}.".format(', '.join(BACKENDS)))
+
+    def _set_words(self, ek, backend, rk=None):
+        """
+        Installs an encryption schedule given as words, rk is a view of it for the numpy backend.
+        The compiled backend generates its unrolled functions here, once per cipher
+        """
+        self.backend = backend
+        self._ek = ek
+        self._dk = ttable.inverse_key(ek)
+        self.Nr = len(ek) // 4 - 1
+        if backend == "numpy":
+            # Single blocks go through the ttable engine, batches through NumPy
+            if rk is None:
+                rk = b''.join([w.to_bytes(4, 'big') for w in ek])
+            self._rk = (numpy_backend.np.frombuffer(rk, dtype=numpy_backend.np.uint8).reshape(-1, 16)
+                        if numpy_backend.HAVE_NUMPY else (self._ek, self._dk))
+        elif backend == "compiled":
+            self._compiled = compiled.compile_schedule(ek, self._dk)
+
+    def _set_round_keys(self, W_list, backend):
+        """
+        Installs an encryption schedule given as round keys
+        """
+        self.backend = backend
+        self._W_list = W_list
+        self.Nr = len(W_list) - 1
+        # Equivalent inverse cipher: InvMixColumns is applied to copies of the middle round keys,
+        # it works in place on a FlatByteMatrix
+        self._dW_list = ([W_list[self.Nr]]
+                         + [InvMixColumns(W_list[i].copy()) for i in range(self.Nr-1, 0, -1)]
+                         + [W_list[0]])
+
+    def _set_bitslice(self, rk):
+        """
+        Installs an encryption schedule given as round keys packed in a bytearray
+        """
+        self.backend = "bitslice"
+        self._rk = rk
+        self.Nr = len(rk) // 16 - 1
+
+    @classmethod
+    def from_schedule(cls, buf, offset=0, backend="ttable"):
+        """
+        Builds a cipher from a serialized schedule, without key expansion. The numpy round
+        keys stay a view on buf, which must not be modified while the cipher is used
+        - input: (buffer) buf, (int) offset of the record, see schedule_io, (str) backend
+        - output: (AES object) no name
+        """
+        if backend not in BACKENDS:
+            raise ValueError("Unknown backend, must be one of {}.".format(', '.join(BACKENDS)))
+        Nr = schedule_io.read_header(buf, offset)
+        start = offset + schedule_io.HEADER_SIZE
+        cipher = cls.__new__(cls)
+        if backend in ("ttable", "numpy", "compiled"):
+            # The numpy round keys are a view on buf
+            rk = memoryview(buf).cast('B')[start:start+16*(Nr+1)]
+            cipher._set_words(schedule_io.load_schedule(buf, offset), backend, rk)
+        elif backend == "bitslice":
+            cipher._set_bitslice(bytearray(memoryview(buf).cast('B')[start:start+16*(Nr+1)]))
+        else:
+            flat = (backend == "flat")
+            cipher._set_round_keys([buffer2ByteMatrix(buf, start + 16*r, flat=flat) for r in range(Nr+1)],
+                                   backend)
+        return cipher
+
+    @classmethod
+    def from_schedules(cls, buf, backend="ttable"):
+        """
+        Builds the ciphers of all the schedules serialized in a buffer
+        - input: (buffer) buf, (str) backend
+        - output: (list of AES objects) no name
+        """
+        return [cls.from_schedule(buf, offset, backend) for offset, _ in schedule_io.iter_records(buf)]
+
+    def dump_schedule(self):
+        """
+        Serializes the encryption schedule, see schedule_io
+        - output: (bytes) record
+        """
+        if self.backend == "bitslice":
+            return schedule_io.dump_schedule(self._rk)
+        return schedule_io.dump_schedule(self._ek if (self.backend in ("ttable", "numpy", "compiled")) else self._W_list)
+
+    def __repr__(self):
+        """
+        Controls the display in the command prompt, the key is never displayed
+        - output: (str) no name
+        """
+        return "< AES-{} Object ({} backend) >".format(32*(self.Nr - 6), self.backend)
+
+    def encrypt_block(self, block):
+        """
+        AES cipher
+        - input: (bytes, 16 B) block
+        - output: (bytes, 16 B) ciphertext
+        """
+        if self.backend == "compiled":
+            return compiled.encrypt_block(block, self._compiled)
+        if self.backend in ("ttable", "numpy"):
+            return ttable.encrypt_block(block, self._ek)
+        if self.backend == "bitslice":
+            return bitslice.encrypt_block(block, self._rk)
+
+        return Cipher(block, self._W_list, flat=(self.backend == "flat"))
+
+    def decrypt_block(self, block):
+        """
+        AES equivalent inverse cipher
+        - input: (bytes, 16 B) block
+        - output: (bytes, 16 B) plaintext
+        """
+        if self.backend == "compiled":
+            return compiled.decrypt_block(block, self._compiled)
+        if self.backend in ("ttable", "numpy"):
+            return ttable.decrypt_block(block, self._dk)
+        if self.backend == "bitslice":
+            return bitslice.decrypt_block(block, self._rk)
+
+        dW_list = self._dW_list
+        state = AddRoundKey(bytes2ByteMatrix(block, flat=(self.backend == "flat")), dW_list[0])
+        for i in range(1, self.Nr):
+            state = AddRoundKey(InvMixColumns(InvShiftRows(InvSubBytes(state))), dW_list[i])
+        state = AddRoundKey(InvShiftRows(InvSubBytes(state)), dW_list[self.Nr])
+        return ByteMatrix2bytes(state)
+
+    def encrypt_into(self, src, src_offset, dst, dst_offset):
+        """
+        AES cipher from the block at an offset of any buffer into a writable buffer at an offset
+        - input: (buffer) src, (int) src_offset, (writable buffer) dst, (int) dst_offset
+        - output: None
+        """
+        if self.backend == "compiled":
+            self._compiled.encrypt_into(src, src_offset, dst, dst_offset)
+        elif self.backend in ("ttable", "numpy"):
+            ttable.encrypt_into(src, src_offset, dst, dst_offset, self._ek)
+        else:
+            # The state is read in place from the memoryview slice by bytes2ByteMatrix
+            block = self.encrypt_block(memoryview(src).cast('B')[src_offset:src_offset+16])
+            memoryview(dst).cast('B')[dst_offset:dst_offset+16] = block
+
+    def decrypt_into(self, src, src_offset, dst, dst_offset):
+        """
+        AES equivalent inverse cipher from a buffer at an offset into a writable buffer at an offset
+        - input: (buffer) src, (int) src_offset, (writable buffer) dst, (int) dst_offset
+        - output: None
+        """
+        if self.backend == "compiled":
+            self._compiled.decrypt_into(src, src_offset, dst, dst_offset)
+        elif self.backend in ("ttable", "numpy"):
+            ttable.decrypt_into(src, src_offset, dst, dst_offset, self._dk)
+        else:
+            # The state is read in place from the memoryview slice by bytes2ByteMatrix
+            block = self.decrypt_block(memoryview(src).cast('B')[src_offset:src_offset+16])
+            memoryview(dst).cast('B')[dst_offset:dst_offset+16] = block
+
+    def _blocks_into(self, data, out, offset, decrypt):
+        try:
+            assert len(data) % 16 == 0
+        except AssertionError:
+            raise ValueError("Data should be a multiple of 16 bytes. Padding is not handled.")
+        if self.backend == "numpy":
+            crypt = numpy_backend.decrypt_blocks_into if decrypt else numpy_backend.encrypt_blocks_into
+            return crypt(data, out, offset, self._rk)
+        if self.backend == "bitslice":
+            crypt = bitslice.decrypt_blocks_into if decrypt else bitslice.encrypt_blocks_into
+            return crypt(data, out, offset, self._rk)
+        if self.backend == "compiled":
+            crypt = compiled.decrypt_blocks_into if decrypt else compiled.encrypt_blocks_into
+            return crypt(data, out, offset, self._compiled)
+        if self.backend == "ttable":
+            crypt, rk = (ttable.decrypt_into, self._dk) if decrypt else (ttable.encrypt_into, self._ek)
+            for k in range(0, len(data), 16):
+                crypt(data, k, out, offset + k, rk)
+        else:
+            crypt = self.decrypt_into if decrypt else self.encrypt_into
+            for k in range(0, len(data), 16):
+                crypt(data, k, out, offset + k)
+        return len(data)
+
+    def encrypt_blocks_into(self, data, out, offset=0):
+        """
+        Encrypts independent blocks (ECB) into a writable buffer at an offset, no block is allocated
+        - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        return self._blocks_into(data, out, offset, False)
+
+    def decrypt_blocks_into(self, data, out, offset=0):
+        """
+        Decrypts independent blocks (ECB) into a writable buffer at an offset, no block is allocated
+        - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        return self._blocks_into(data, out, offset, True)
+
+    def encrypt_blocks(self, data):
+        """
+        Encrypts independent blocks (ECB), vectorized with the numpy backend
+        - input: (buffer, multiple of 16 B) data
+        - output: (bytes) no name
+        """
+        out = bytearray(len(data))
+        self._blocks_into(data, out, 0, False)
+        return bytes(out)
+
+    def decrypt_blocks(self, data):
+        """
+        Decrypts independent blocks (ECB), vectorized with the numpy backend
+        - input: (buffer, multiple of 16 B) data
+        - output: (bytes) no name
+        """
+        out = bytearray(len(data))
+        self._blocks_into(data, out, 0, True)
+        return bytes(out)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: CMAC message authentication code (RFC 4493) for AES Cipher
+"""
+
+#-- Import --#
+import hmac
+from modes import *
+#- End Import -#
+
+def _double(block):
+    """
+    Multiplication by x in F_2^128 with the polynomial x^128 + x^7 + x^2 + x + 1
+    - input: (int) block
+    - output: (int) no name
+    """
+    block <<= 1
+    return (block ^ 0x87) & ((1 << 128) - 1) if (block >> 128) else block
+
+def _check_mac_length(mac_length):
+    try:
+        assert (type(mac_length) == int) and (4 <= mac_length <= 16)
+    except AssertionError:
+        raise ValueError("MAC length should be between 4 and 16 bytes.")
+    return mac_length
+
+class CMACKey:
+    """
+    Key of CMAC: the expanded key and the subkeys K1, K2 are computed once, then any
+    number of messages is authenticated
+    - attributes : (AES object) cipher, (int) mac_length
+    - methods : *init, new, mac, verify, mac_batch, verify_batch
+    """
+
+    def __init__(self, key, mac_length=16):
+        """
+        - input: (bytes or AES object) key, (int) mac_length in bytes, 4 to 16
+        """
+        self.cipher = get_cipher(key)
+        self.mac_length = _check_mac_length(mac_length)
+        L = int.from_bytes(self.cipher.encrypt_block(bytes(16)), 'big')
+        self._k1 = _double(L)
+        self._k2 = _double(self._k1)
+
+    def __repr__(self):
+        return "< CMAC Object ({!r}) >".format(self.cipher)
+
+    def _last_block(self, last):
+        """
+        Last block of a message XORed with its subkey, incomplete blocks are padded with 10...0
+        - input: (bytes, 0 to 16 B) last
+        - output: (int) no name
+        """
+        if len(last) == BLOCK_SIZE:
+            return int.from_bytes(last, 'big') ^ self._k1
+        return int.from_bytes(last + b'\x80' + bytes(BLOCK_SIZE - 1 - len(last)), 'big') ^ self._k2
+
+    def new(self, data=b''):
+        """
+        Incremental computation of a MAC
+        - input: (bytes) data, first piece of the message
+        - output: (CMAC object) no name
+        """
+        return CMAC(self, data)
+
+    def mac(self, data):
+        """
+        MAC of a message
+        - input: (bytes) data
+        - output: (bytes) tag
+        """
+        return CMAC(self, data).digest()
+
+    def verify(self, data, tag):
+        """
+        Checks the tag of a message in constant time
+        - input: (bytes) data, (bytes) tag
+        - output: None, raises ValueError if the tag is wrong
+        """
+        if not hmac.compare_digest(self.mac(data), bytes(tag)):
+            raise ValueError("MAC check failed.")
+
+    def mac_batch(self, messages):
+        """
+        MACs of many messages. The chains are independent, block j of all the messages
+        is encrypted in one call, vectorized by the numpy and bitslice backends
+        - input: (list of bytes) messages
+        - output: (list of bytes) tags
+        """
+        blocks = []
+        for data in messages:
+            data = bytes(data)
+            end = max(0, (len(data) - 1) // BLOCK_SIZE * BLOCK_SIZE)
+            blocks.append([int.from_bytes(data[k:k+BLOCK_SIZE], 'big') for k in range(0, end, BLOCK_SIZE)]
+                          + [self._last_block(data[end:])])
+        states = [0]*len(blocks)
+        for j in range(max(map(len, blocks), default=0)):
+            active = [i for i in range(len(blocks)) if len(blocks[i]) > j]
+            data = b''.join([(states[i] ^ blocks[i][j]).to_bytes(16, 'big') for i in active])
+            out = self.cipher.encrypt_blocks(data)
+            for k, i in enumerate(active):
+                states[i] = int.from_bytes(out[16*k:16*(k+1)], 'big')
+        return [state.to_bytes(16, 'big')[:self.mac_length] for state in states]
+
+    def verify_batch(self, pairs):
+        """
+        Checks many (message, tag) pairs, each comparison in constant time
+        - input: (list of tuples) message, tag
+        - output: (list of bool) validity of each pair
+        """
+        pairs = list(pairs)
+        tags = self.mac_batch([data for data, _ in pairs])
+        return [hmac.compare_digest(mac, bytes(tag)) for mac, (_, tag) in zip(tags, pairs)]
+
+class CMAC:
+    """
+    Incremental CMAC of one message
+    - attributes : (CMACKey object) key
+    - methods : *init, update, digest, hexdigest, verify, copy
+    """
+
+    def __init__(self, key, data=b'', mac_length=16):
+        """
+        - input: (CMACKey object, bytes or AES object) key, (bytes) data, first piece of the message,
+                 (int) mac_length, used when key is not a CMACKey object
+        """
+        self.key = key if (type(key) == CMACKey) else CMACKey(key, mac_length)
+        self._state = 0
+        self._buf = b''
+        self.update(data)
+
+    def update(self, data):
+        """
+        Absorbs a piece of the message. The last block is kept until digest
+        - input: (bytes) data
+        - output: None
+        """
+        data = self._buf + bytes(data)
+        # The last block, even complete, is processed with its subkey in digest
+        end = max(0, (len(data) - 1) // BLOCK_SIZE * BLOCK_SIZE)
+        state, encrypt_block = self._state, self.key.cipher.encrypt_block
+        for k in range(0, end, BLOCK_SIZE):
+            block = (state ^ int.from_bytes(data[k:k+BLOCK_SIZE], 'big')).to_bytes(16, 'big')
+            state = int.from_bytes(encrypt_block(block), 'big')
+        self._state = state
+        self._buf = data[end:]
+
+    def digest(self):
+        """
+        MAC of the message absorbed so far, more data can still be absorbed
+        - output: (bytes) tag
+        """
+        block = (self._state ^ self.key._last_block(self._buf)).to_bytes(16, 'big')
+        return self.key.cipher.encrypt_block(block)[:self.key.mac_length]
+
+    def hexdigest(self):
+        """
+        - output: (str) tag, hexadecimal
+        """
+        return self.digest().hex()
+
+    def verify(self, tag):
+        """
+        Checks a tag in constant time
+        - input: (bytes) tag
+        - output: None, raises ValueError if the tag is wrong
+        """
+        if not hmac.compare_digest(self.digest(), bytes(tag)):
+            raise ValueError("MAC check failed.")
+
+    def copy(self):
+        """
+        Copy of the computation, to MAC several messages sharing a prefix
+        - output: (CMAC object) no name
+        """
+        other = CMAC.__new__(CMAC)
+        other.key, other._state, other._buf = self.key, self._state, self._buf
+        return other
+
+def cmac(data, key, mac_length=16):
+    """
+    CMAC of a message
+    - input: (bytes) data, (CMACKey object, bytes or AES object) key, (int) mac_length
+    - output: (bytes) tag
+    """
+    return CMAC(key, data, mac_length).digest()
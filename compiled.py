@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Code generation engine for AES Cipher. The rounds of the ttable engine are
+           unrolled into straight-line Python functions, compiled with compile/exec
+           once per key size and direction. The round keys are read at constant
+           indices of a list bound to the functions of each key, which can be zeroized.
+           The generated functions do not validate their arguments, encrypt_block and
+           decrypt_block check the length of the block before calling them.
+"""
+
+#-- Import --#
+import functools
+import struct
+import ttable
+from constants import check_block
+#- End Import -#
+
+_words = struct.Struct('>4I')
+
+def _rounds(Nr, decrypt):
+    """
+    Lines of the unrolled rounds, the state is read from s0..s3 and left in u0..u3
+    - input: (int) Nr, (bool) decrypt
+    - output: (list of str) lines
+    """
+    T, box = ("Td", "InvSBox") if decrypt else ("Te", "SBox")
+    # Column c of the next state takes row i from column c+i (encryption) or c-i (decryption)
+    src = (lambda c, i: (c - i) % 4) if decrypt else (lambda c, i: (c + i) % 4)
+
+    lines = ["s{0} ^= rk[{0}]".format(c) for c in range(4)]
+    a, b = "s", "t"
+    for r in range(1, Nr):
+        for c in range(4):
+            lines.append("{b}{c} = {T}0[{a}{0} >> 24] ^ {T}1[({a}{1} >> 16) & 255] ^ {T}2[({a}{2} >> 8) & 255]"
+                         " ^ {T}3[{a}{3} & 255] ^ rk[{k}]".format(*[src(c, i) for i in range(4)],
+                                                                 a=a, b=b, c=c, T=T, k=4*r + c))
+        a, b = b, a
+    for c in range(4):
+        lines.append("u{c} = (({box}[{a}{0} >> 24] << 24) | ({box}[({a}{1} >> 16) & 255] << 16)"
+                     " | ({box}[({a}{2} >> 8) & 255] << 8) | {box}[{a}{3} & 255]) ^ rk[{k}]".format(
+                         *[src(c, i) for i in range(4)], a=a, c=c, box=box, k=4*Nr + c))
+    return lines
+
+def _source(Nr, decrypt):
+    """
+    Source code of the block function and of the buffer function of one direction
+    """
+    T, box = ("Td", "InvSBox") if decrypt else ("Te", "SBox")
+    defaults = "rk=rk, {0}0={0}0, {0}1={0}1, {0}2={0}2, {0}3={0}3, {1}={1}".format(T, box)
+    body = ["    " + line for line in _rounds(Nr, decrypt)]
+    return '\n'.join(
+        ["def block(block, unpack=_words.unpack, pack=_words.pack, {}):".format(defaults),
+         "    s0, s1, s2, s3 = unpack(block)"]
+        + body
+        + ["    return pack(u0, u1, u2, u3)",
+           "",
+           "def into(src, src_offset, dst, dst_offset, unpack_from=_words.unpack_from,"
+           " pack_into=_words.pack_into, {}):".format(defaults),
+           "    s0, s1, s2, s3 = unpack_from(src, src_offset)"]
+        + body
+        + ["    pack_into(dst, dst_offset, u0, u1, u2, u3)", ""])
+
+@functools.lru_cache(maxsize=None)
+def _code(Nr, decrypt):
+    """
+    Compiled code of one key size and direction, at most 6 are built
+    """
+    return compile(_source(Nr, decrypt), "<aes-{}-{}>".format("decrypt" if decrypt else "encrypt", Nr), "exec")
+
+def _build(rk, decrypt):
+    """
+    Binds the compiled functions of one direction to a list of round keys
+    - output: (tuple) block, into
+    """
+    if not ttable._loaded:
+        ttable._load_tables()
+    namespace = {"_words": _words, "rk": rk, "SBox": ttable.SBox, "InvSBox": ttable.InvSBox,
+                 "Te0": ttable.Te0, "Te1": ttable.Te1, "Te2": ttable.Te2, "Te3": ttable.Te3,
+                 "Td0": ttable.Td0, "Td1": ttable.Td1, "Td2": ttable.Td2, "Td3": ttable.Td3}
+    exec(_code(len(rk) // 4 - 1, decrypt), namespace)
+    return namespace["block"], namespace["into"]
+
+class CompiledSchedule:
+    """
+    Unrolled functions of an expanded key, bound to the lists ek and dk
+    - attributes : (function) encrypt, encrypt_into, decrypt, decrypt_into, (list of int) ek, dk
+    - methods : *init, zeroize
+    """
+    __slots__ = ("encrypt", "encrypt_into", "decrypt", "decrypt_into", "ek", "dk")
+
+    def __init__(self, ek, dk=None):
+        """
+        - input: (list of int) ek, as returned by ttable.expand_key, (list of int) dk, computed if None.
+                 The lists are used in place
+        """
+        self.ek = ek
+        self.dk = ttable.inverse_key(ek) if (dk is None) else dk
+        self.encrypt, self.encrypt_into = _build(self.ek, False)
+        self.decrypt, self.decrypt_into = _build(self.dk, True)
+
+    def zeroize(self):
+        """
+        Overwrites the round keys with zeros, the functions then compute garbage
+        - output: None
+        """
+        self.ek[:] = [0]*len(self.ek)
+        self.dk[:] = [0]*len(self.dk)
+
+def compile_schedule(ek, dk=None):
+    """
+    Generates the unrolled functions of an encryption schedule
+    - input: (list of int) ek, as returned by ttable.expand_key, (list of int) dk, computed if None
+    - output: (CompiledSchedule object) no name
+    """
+    return CompiledSchedule(ek, dk)
+
+def compile_key(key):
+    """
+    Expands a key and generates its unrolled functions
+    - input: (bytes, 16/24/32 B) key
+    - output: (CompiledSchedule object) no name
+    """
+    return compile_schedule(ttable.expand_key(key))
+
+def encrypt_block(block, schedule):
+    """
+    AES cipher with the unrolled functions, the length of the block is checked
+    - input: (bytes, 16 B) block, (CompiledSchedule object) schedule
+    - output: (bytes, 16 B) ciphertext
+    """
+    check_block(block)
+    return schedule.encrypt(block)
+
+def decrypt_block(block, schedule):
+    """
+    AES equivalent inverse cipher with the unrolled functions, the length of the block is checked
+    - input: (bytes, 16 B) block, (CompiledSchedule object) schedule
+    - output: (bytes, 16 B) plaintext
+    """
+    check_block(block)
+    return schedule.decrypt(block)
+
+def _crypt_blocks_into(data, out, offset, crypt):
+    try:
+        assert len(data) % 16 == 0
+    except AssertionError:
+        raise ValueError("Data should be a multiple of 16 bytes. Padding is not handled.")
+    for k in range(0, len(data), 16):
+        crypt(data, k, out, offset + k)
+    return len(data)
+
+def encrypt_blocks_into(data, out, offset, schedule):
+    """
+    Encrypts independent blocks (ECB) into a writable buffer at an offset
+    - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset, (CompiledSchedule object) schedule
+    - output: (int) number of bytes written
+    """
+    return _crypt_blocks_into(data, out, offset, schedule.encrypt_into)
+
+def decrypt_blocks_into(data, out, offset, schedule):
+    """
+    Decrypts independent blocks (ECB) into a writable buffer at an offset
+    - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset, (CompiledSchedule object) schedule
+    - output: (int) number of bytes written
+    """
+    return _crypt_blocks_into(data, out, offset, schedule.decrypt_into)
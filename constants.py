@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 """
     Created: 10/11/2020
-    Last modification: 10/11/2020
+    Last modification: 10/18/2026
 
     @creator: coconutj
 
-    Brief: S-box and Inverse S-Box 
+    Brief: S-box and Inverse S-Box, and the block size check shared by the engines
 """
 
 #-- Import --#
@@ -61,3 +61,14 @@ Rcon = ByteMatrix([[Byte(0x01), Byte(0x02), Byte(0x04), Byte(0x08), Byte(0x10),
 					[Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00)],
 					[Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00), Byte(0x00)]], m=4, n=14)
 
+def check_block(block):
+	"""
+	Checks the length of a single block, the engines do not pad
+	- input: (bytes-like) block
+	- output: (bytes-like) block
+	"""
+	try:
+		assert len(block) == 16
+	except AssertionError:
+		raise ValueError("Block should be 16 bytes. Padding is not handled.")
+	return block
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Random-access CTR decryption of byte ranges for AES Cipher
+"""
+
+#-- Import --#
+import collections
+import threading
+from modes import *
+#- End Import -#
+
+# Keystream is computed and cached by pages of PAGE_BLOCKS blocks (1 KiB)
+PAGE_BLOCKS = 64
+PAGE_SIZE = PAGE_BLOCKS*BLOCK_SIZE
+
+class CTRReader:
+    """
+    Decrypts any byte range of a CTR ciphertext without processing what comes before.
+    The keystream of recently read pages is kept for adjacent reads, ranges smaller than
+    a page compute only their own blocks unless their pages are cached.
+    - attributes : (AES object) cipher, (int) counter, (file-like object) source, (int) cache_pages
+    - methods : *init, keystream, decrypt_range, read
+    """
+
+    def __init__(self, key, iv, source=None, cache_pages=64):
+        """
+        - input: (bytes or AES object) key, (bytes, 16 B) iv initial counter block,
+                 (seekable binary file or bytes-like) source of the ciphertext, optional,
+                 (int) cache_pages number of keystream pages kept
+        """
+        self.cipher = get_cipher(key)
+        self.counter = initial_counter(iv)
+        self.source = source
+        self.cache_pages = cache_pages
+        self._pages = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _page(self, index):
+        with self._lock:
+            page = self._pages.get(index)
+            if page is not None:
+                self._pages.move_to_end(index)
+                return page
+        page = bytearray(PAGE_SIZE)
+        ctr_keystream_into(self.cipher, self.counter + index*PAGE_BLOCKS, PAGE_BLOCKS, page)
+        page = bytes(page)
+        with self._lock:
+            self._pages[index] = page
+            while len(self._pages) > self.cache_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def _blocks(self, offset, length):
+        """
+        Keystream of a range computed from the blocks covering it only, without the cache
+        """
+        first, last = offset // BLOCK_SIZE, (offset + length - 1) // BLOCK_SIZE
+        stream = bytearray(BLOCK_SIZE*(last - first + 1))
+        ctr_keystream_into(self.cipher, self.counter + first, last - first + 1, stream)
+        start = offset - first*BLOCK_SIZE
+        return bytes(stream[start:start+length])
+
+    def _cached(self, first, last):
+        with self._lock:
+            return all([index in self._pages for index in range(first, last + 1)])
+
+    def keystream(self, offset, length):
+        """
+        Keystream bytes of a range. Ranges of at least a page are computed by whole pages,
+        which are cached. Smaller ranges, and all ranges when cache_pages is 0, are computed
+        from the blocks covering them only, unless their pages are already cached
+        - input: (int) offset, (int) length
+        - output: (bytes) no name
+        """
+        try:
+            assert (type(offset) == int) and (type(length) == int) and (offset >= 0) and (length >= 0)
+        except AssertionError:
+            raise ValueError("Offset and length must be non-negative integers.")
+        if length == 0:
+            return b''
+        first, last = offset // PAGE_SIZE, (offset + length - 1) // PAGE_SIZE
+        if (self.cache_pages == 0) or ((length < PAGE_SIZE) and not self._cached(first, last)):
+            return self._blocks(offset, length)
+        start = offset - first*PAGE_SIZE
+        if first == last:
+            return self._page(first)[start:start+length]
+        stream = b''.join([self._page(index) for index in range(first, last + 1)])
+        return stream[start:start+length]
+
+    def decrypt_range(self, data, offset):
+        """
+        Decrypts (or encrypts) the ciphertext bytes found at an offset of the stream
+        - input: (bytes) data, (int) offset of data[0] in the stream
+        - output: (bytes) no name
+        """
+        return xor_bytes(bytes(data), self.keystream(offset, len(data)))
+
+    def read(self, offset, length):
+        """
+        Reads and decrypts a range of the source, the range is cut at the end of the source
+        - input: (int) offset, (int) length
+        - output: (bytes) plaintext
+        """
+        if self.source is None:
+            raise ValueError("No source to read the ciphertext from.")
+        if hasattr(self.source, "seek"):
+            self.source.seek(offset)
+            data = self.source.read(length)
+        else:
+            data = self.source[offset:offset+length]
+        return self.decrypt_range(data, offset)
+
+def ctr_decrypt_range(data, key, iv, offset):
+    """
+    CTR decryption (or encryption) of bytes located at an offset of the stream
+    - input: (bytes) data, (bytes or AES object) key, (bytes, 16 B) iv, (int) offset
+    - output: (bytes) no name
+    """
+    return CTRReader(key, iv, cache_pages=0).decrypt_range(data, offset)
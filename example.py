@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
     Created: 10/11/2020
-    Last modification: 10/11/2020
+    Last modification: 10/18/2026
 
     @creator: coconutj
 
@@ -9,22 +9,154 @@
 """
 
 #-- Import --#
-from aes_functions import Enc, Dec
+from aes_functions import Enc, Dec, BACKENDS
+from gcm import gcm_encrypt, gcm_decrypt
+from cmac import cmac
+import os
+import tempfile
+from modes import CTR, MODES, ctr_encrypt
+from streaming import encrypt_iter, decrypt_iter
+from parallel import ParallelCipher
+from mmap_crypt import crypt_file
+from byte import set_validation
 #- End Import -#
 
-def test_aes(plaintext, key):
+def test_aes(plaintext, key, ciphertext, backend="bytematrix"):
 	"""
-	Run the AES cipher and inverse cipher to verify correctness
-	- input: (bytes) plaintext, (bytes) key
+	Run the AES cipher and inverse cipher against a known answer
+	- input: (bytes) plaintext, (bytes) key, (bytes) ciphertext expected, (str) backend
 	- output: None
 	"""
-	print("[+] Running test of AES.")
+	print("[+] Running test of AES ({} backend).".format(backend))
 	print("Plaintext: {}\nKey: {}".format(' '.join(["%02x" % b for b in plaintext]), ' '.join(["%02x" % b for b in key])))
-	ciphertext = Enc(plaintext, key)
-	print("Ciphertext: {}".format(' '.join(["%02x" % b for b in ciphertext])))
-	recovered_plaintext = Dec(ciphertext, key)
+	result = Enc(plaintext, key, backend)
+	print("Ciphertext: {}".format(' '.join(["%02x" % b for b in result])))
+	recovered_plaintext = Dec(ciphertext, key, backend)
 	print("Recovered plaintext: {}".format(' '.join(["%02x" % b for b in recovered_plaintext])))
-	correct = plaintext == recovered_plaintext
+	correct = (result == ciphertext) and (plaintext == recovered_plaintext)
+	print("Correctness: {}".format(correct))
+	if correct:
+		print("[+] Test completed: PASS.\n")
+	else:
+		print("[+] Test completed: FAIL.\n")
+
+def test_gcm(plaintext, key, iv, aad, ciphertext, tag):
+	"""
+	Run AES-GCM encryption and decryption against a known answer
+	- input: (bytes) plaintext, (bytes) key, (bytes) iv, (bytes) aad, (bytes) ciphertext, (bytes) tag expected
+	- output: None
+	"""
+	print("[+] Running test of AES-GCM ({}-bit IV).".format(8*len(iv)))
+	result, result_tag = gcm_encrypt(plaintext, key, iv, aad)
+	print("Ciphertext: {}\nTag: {}".format(result.hex(), result_tag.hex()))
+	correct = (result == ciphertext) and (result_tag == tag) and (gcm_decrypt(ciphertext, key, iv, tag, aad) == plaintext)
+	print("Correctness: {}".format(correct))
+	if correct:
+		print("[+] Test completed: PASS.\n")
+	else:
+		print("[+] Test completed: FAIL.\n")
+
+def test_cmac(message, key, tag):
+	"""
+	Run AES-CMAC against a known answer
+	- input: (bytes) message, (bytes) key, (bytes) tag expected
+	- output: None
+	"""
+	print("[+] Running test of AES-CMAC ({} bytes message).".format(len(message)))
+	result = cmac(message, key)
+	print("Tag: {}".format(result.hex()))
+	correct = result == tag
+	print("Correctness: {}".format(correct))
+	if correct:
+		print("[+] Test completed: PASS.\n")
+	else:
+		print("[+] Test completed: FAIL.\n")
+
+def test_ctr_into(plaintext, key, iv, ciphertext):
+	"""
+	Run AES-CTR encryption into a larger buffer and in place against a known answer,
+	the bytes of the buffer around the data must be left untouched
+	- input: (bytes) plaintext, (bytes) key, (bytes) iv, (bytes) ciphertext expected
+	- output: None
+	"""
+	print("[+] Running test of AES-CTR into a buffer ({} bytes message).".format(len(plaintext)))
+	n = len(plaintext)
+	out = bytearray(b'\xa5'*(n + 37))
+	CTR(key, iv).encrypt_into(plaintext, out, 5)
+	correct = (out[5:5+n] == ciphertext) and (out[:5] + out[5+n:] == b'\xa5'*37)
+	buffer = bytearray(plaintext) + bytearray(b'\xa5'*16)
+	view, cut = memoryview(buffer), n // 3
+	ctr = CTR(key, iv)
+	ctr.encrypt_into(view[:cut], buffer, 0)
+	ctr.encrypt_into(view[cut:n], buffer, cut)
+	print("Ciphertext: {}".format(bytes(buffer[:n]).hex()))
+	correct = correct and (buffer[:n] == ciphertext) and (buffer[n:] == b'\xa5'*16)
+	print("Correctness: {}".format(correct))
+	if correct:
+		print("[+] Test completed: PASS.\n")
+	else:
+		print("[+] Test completed: FAIL.\n")
+
+def test_mode(mode, plaintext, key, iv, ciphertext):
+	"""
+	Run a mode of operation against a known answer, in one call and by chunks of 7 bytes through streaming
+	- input: (str) mode in MODES, (bytes) plaintext, (bytes) key, (bytes) iv, (bytes) ciphertext expected
+	- output: None
+	"""
+	print("[+] Running test of AES-{} ({} bytes message).".format(mode.upper(), len(plaintext)))
+	new = lambda: MODES[mode](key) if (mode == "ecb") else MODES[mode](key, iv)
+	result = new().encrypt(plaintext)
+	print("Ciphertext: {}".format(result.hex()))
+	streamed = b''.join(encrypt_iter([plaintext[k:k+7] for k in range(0, len(plaintext), 7)], key, mode, iv, False))
+	recovered = b''.join(decrypt_iter([ciphertext[k:k+7] for k in range(0, len(ciphertext), 7)], key, mode, iv, False))
+	correct = (result == ciphertext) and (streamed == ciphertext) and (new().decrypt(ciphertext) == plaintext) \
+			  and (recovered == plaintext)
+	print("Correctness: {}".format(correct))
+	if correct:
+		print("[+] Test completed: PASS.\n")
+	else:
+		print("[+] Test completed: FAIL.\n")
+
+def test_parallel(plaintext, key, iv, counter, ecb_ciphertext, cbc_ciphertext, ctr_ciphertext):
+	"""
+	Run the parallel modes over two workers and chunks of 32 bytes against known answers,
+	and a round trip of a padded message
+	- input: (bytes) plaintext, (bytes) key, (bytes) iv of CBC, (bytes) counter initial block of CTR,
+			 (bytes) ecb_ciphertext, cbc_ciphertext, ctr_ciphertext expected
+	- output: None
+	"""
+	print("[+] Running test of the parallel modes ({} bytes message).".format(len(plaintext)))
+	message = plaintext*40 + plaintext[:21]
+	with ParallelCipher(key, workers=2, chunk_size=32) as pc:
+		correct = (pc.ecb_encrypt(plaintext, False) == ecb_ciphertext) and (pc.ecb_decrypt(ecb_ciphertext, False) == plaintext) \
+				  and (pc.cbc_decrypt(cbc_ciphertext, iv, False) == plaintext) and (pc.ctr(plaintext, counter) == ctr_ciphertext) \
+				  and (pc.ecb_decrypt(pc.ecb_encrypt(message)) == message) and (pc.ctr(pc.ctr(message, counter), counter) == message)
+	print("Correctness: {}".format(correct))
+	if correct:
+		print("[+] Test completed: PASS.\n")
+	else:
+		print("[+] Test completed: FAIL.\n")
+
+def test_mmap(plaintext, key, iv, ciphertext):
+	"""
+	Run AES-CTR on a file of several windows into another file against a known answer,
+	then decrypt it back in place
+	- input: (bytes) plaintext, (bytes) key, (bytes) iv, (bytes) ciphertext expected of plaintext
+	- output: None
+	"""
+	message = plaintext*200 + plaintext[:21]
+	print("[+] Running test of AES-CTR through mmap ({} bytes file).".format(len(message)))
+	with tempfile.TemporaryDirectory() as directory:
+		src, dst = os.path.join(directory, "plaintext"), os.path.join(directory, "ciphertext")
+		with open(src, "wb") as f:
+			f.write(message)
+		crypt_file(src, key, iv, dst, window=4096)
+		with open(dst, "rb") as f:
+			result = f.read()
+		crypt_file(dst, key, iv, window=4096)
+		with open(dst, "rb") as f:
+			recovered = f.read()
+	correct = (result[:len(ciphertext)] == ciphertext) and (result == ctr_encrypt(message, key, iv)) and (recovered == message)
 	print("Correctness: {}".format(correct))
 	if correct:
 		print("[+] Test completed: PASS.\n")
@@ -32,22 +164,99 @@ def test_aes(plaintext, key):
 		print("[+] Test completed: FAIL.\n")
 
 if __name__ == '__main__':
+	# Checks of ByteMatrix() stay enabled in the tests, whatever AES_VALIDATE says
+	set_validation(True)
 	print("[+] Running examples of FIPS-197 standard.\n")
-	# Test AES-128
+	# Test AES-128 (Appendix B)
 	plaintext128 = b'\x32\x43\xf6\xa8\x88\x5a\x30\x8d\x31\x31\x98\xa2\xe0\x37\x07\x34'
 	key128 = b'\x2b\x7e\x15\x16\x28\xae\xd2\xa6\xab\xf7\x15\x88\x09\xcf\x4f\x3c'
-	test_aes(plaintext128, key128)
+	ciphertext = bytes.fromhex('3925841d02dc09fbdc118597196a0b32')
+	for backend in BACKENDS:
+		test_aes(plaintext128, key128, ciphertext, backend)
 
 	plaintext = b'\x00\x11\x22\x33\x44\x55\x66\x77\x88\x99\xaa\xbb\xcc\xdd\xee\xff'
 	
-	# Test AES-128
+	# Test AES-128 (Appendix C.1)
 	key128 = b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
-	test_aes(plaintext, key128)
+	ciphertext = bytes.fromhex('69c4e0d86a7b0430d8cdb78070b4c55a')
+	for backend in BACKENDS:
+		test_aes(plaintext, key128, ciphertext, backend)
 	
-	# Test AES-192
+	# Test AES-192 (Appendix C.2)
 	key192 = b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f\x10\x11\x12\x13\x14\x15\x16\x17'
-	test_aes(plaintext, key192)
+	ciphertext = bytes.fromhex('dda97ca4864cdfe06eaf70a0ec0d7191')
+	for backend in BACKENDS:
+		test_aes(plaintext, key192, ciphertext, backend)
 
-	# Test AES-256
+	# Test AES-256 (Appendix C.3)
 	key256 = b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f'
-	test_aes(plaintext, key256)
\ No newline at end of file
+	ciphertext = bytes.fromhex('8ea2b7ca516745bfeafc49904b496089')
+	for backend in BACKENDS:
+		test_aes(plaintext, key256, ciphertext, backend)
+
+	print("[+] Running test cases of the GCM specification.\n")
+	# Test cases 1 and 2: zero key and IV
+	test_gcm(b'', bytes(16), bytes(12), b'', b'', bytes.fromhex('58e2fccefa7e3061367f1d57a4e7455a'))
+	test_gcm(bytes(16), bytes(16), bytes(12), b'', bytes.fromhex('0388dace60b6a392f328c2b971b2fe78'),
+			 bytes.fromhex('ab6e47d42cec13bdf53a67b21257bddf'))
+
+	key = bytes.fromhex('feffe9928665731c6d6a8f9467308308')
+	plaintext = bytes.fromhex('d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72'
+							  '1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b391aafd255')
+	aad = bytes.fromhex('feedfacedeadbeeffeedfacedeadbeefabaddad2')
+	# Test case 3: 96-bit IV, no AAD
+	test_gcm(plaintext, key, bytes.fromhex('cafebabefacedbaddecaf888'), b'',
+			 bytes.fromhex('42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e'
+						   '21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091473f5985'),
+			 bytes.fromhex('4d5c2af327cd64a62cf35abd2ba6fab4'))
+	# Test case 4: 96-bit IV, AAD, partial last block
+	test_gcm(plaintext[:60], key, bytes.fromhex('cafebabefacedbaddecaf888'), aad,
+			 bytes.fromhex('42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e'
+						   '21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091'),
+			 bytes.fromhex('5bc94fbc3221a5db94fae95ae7121a47'))
+	# Test case 5: 64-bit IV
+	test_gcm(plaintext[:60], key, bytes.fromhex('cafebabefacedbad'), aad,
+			 bytes.fromhex('61353b4c2806934a777ff51fa22a4755699b2a714fcdc6f83766e5f97b6c7423'
+						   '73806900e49f24b22b097544d4896b424989b5e1ebac0f07c23f4598'),
+			 bytes.fromhex('3612d2e79e3b0785561be14aaca2fccb'))
+	# Test case 6: 480-bit IV
+	test_gcm(plaintext[:60], key,
+			 bytes.fromhex('9313225df88406e555909c5aff5269aa6a7a9538534f7da1e4c303d2a318a728'
+						   'c3c0c95156809539fcf0e2429a6b525416aedbf5a0de6a57a637b39b'), aad,
+			 bytes.fromhex('8ce24998625615b603a033aca13fb894be9112a5c3a211a8ba262a3cca7e2ca7'
+						   '01e4a9a4fba43c90ccdcb281d48c7c6fd62875d2aca417034c34aee5'),
+			 bytes.fromhex('619cc5aefffe0bfa462af43c1699d050'))
+
+	print("[+] Running examples of RFC 4493.\n")
+	key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+	message = bytes.fromhex('6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51'
+							'30c81c46a35ce411e5fbc1191a0a52eff69f2445df4f9b17ad2b417be66c3710')
+	test_cmac(message[:0], key, bytes.fromhex('bb1d6929e95937287fa37d129b756746'))
+	test_cmac(message[:16], key, bytes.fromhex('070a16b46b4d4144f79bdd9dd04a287c'))
+	test_cmac(message[:40], key, bytes.fromhex('dfa66747de9ae63030ca32611497c827'))
+	test_cmac(message[:64], key, bytes.fromhex('51f0bebf7e3b9d92fc49741779363cfe'))
+
+	print("[+] Running example F.5.1 of SP 800-38A into buffers.\n")
+	ciphertext = bytes.fromhex('874d6191b620e3261bef6864990db6ce9806f66b7970fdff8617187bb9fffdff'
+							   '5ae4df3edbd5d35e5b4f09020db03eab1e031dda2fbe03d1792170a0f3009cee')
+	test_ctr_into(message, key, bytes.fromhex('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff'), ciphertext)
+	test_ctr_into(message[:41], key, bytes.fromhex('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff'), ciphertext[:41])
+
+	print("[+] Running examples F.1.1 to F.5.1 of SP 800-38A (AES-128).\n")
+	iv = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+	counter = bytes.fromhex('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff')
+	ecb_ciphertext = bytes.fromhex('3ad77bb40d7a3660a89ecaf32466ef97f5d3d58503b9699de785895a96fdbaaf'
+								   '43b1cd7f598ece23881b00e3ed0306887b0c785e27e8ad3f8223207104725dd4')
+	cbc_ciphertext = bytes.fromhex('7649abac8119b246cee98e9b12e9197d5086cb9b507219ee95db113a917678b2'
+								   '73bed6b8e3c1743b7116e69e222295163ff1caa1681fac09120eca307586e1a7')
+	test_mode("ecb", message, key, None, ecb_ciphertext)
+	test_mode("cbc", message, key, iv, cbc_ciphertext)
+	test_mode("cfb", message, key, iv,
+			  bytes.fromhex('3b3fd92eb72dad20333449f8e83cfb4ac8a64537a0b3a93fcde3cdad9f1ce58b'
+							'26751f67a3cbb140b1808cf187a4f4dfc04b05357c5d1c0eeac4c66f9ff7f2e6'))
+	test_mode("ofb", message, key, iv,
+			  bytes.fromhex('3b3fd92eb72dad20333449f8e83cfb4a7789508d16918f03f53c52dac54ed825'
+							'9740051e9c5fecf64344f7a82260edcc304c6528f659c77866a510d9c1d6ae5e'))
+	test_mode("ctr", message, key, counter, ciphertext)
+	test_parallel(message, key, iv, counter, ecb_ciphertext, cbc_ciphertext, ciphertext)
+	test_mmap(message, key, counter, ciphertext)
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Galois/Counter Mode (NIST SP 800-38D) authenticated encryption for AES Cipher.
+           GHASH uses 8-bit Shoup tables, computed once per AES object and reused by
+           all the messages encrypted with it.
+"""
+
+#-- Import --#
+import hmac
+import weakref
+from modes import *
+#- End Import -#
+
+# x^128 = x^7 + x^2 + x + 1, in the reflected bit order of GCM
+_R = 0xe1 << 120
+
+def _reduction_table():
+    """
+    Reduction of the 8 bits shifted out when an element is multiplied by x^8
+    - output: (list of 256 int) no name
+    """
+    table = []
+    for rem in range(256):
+        r = 0
+        for b in range(8):
+            if (rem >> b) & 1:
+                r ^= _R >> (7 - b)
+        table.append(r)
+    return table
+
+_R8 = _reduction_table()
+
+def _shoup_table(H):
+    """
+    Products of H by all the elements of degree < 8
+    - input: (bytes, 16 B) H
+    - output: (list of 256 int) table, table[0x80] = H, table[0x40] = H*x, ..., table[0x01] = H*x^7
+    """
+    h = int.from_bytes(H, 'big')
+    table = [0]*256
+    bit = 0x80
+    while bit:
+        table[bit] = h
+        h = (h >> 1) ^ _R if (h & 1) else (h >> 1)
+        bit >>= 1
+    for i in range(2, 256):
+        if i & (i - 1):
+            low = i & -i
+            table[i] = table[low] ^ table[i ^ low]
+    return table
+
+# Tables of the hash key of each AES object, dropped with the object
+_tables = weakref.WeakKeyDictionary()
+
+def _cipher_table(cipher):
+    """
+    Shoup table of the hash key H = E_K(0^128) of a cipher, built on first use
+    - input: (AES object) cipher
+    - output: (list of 256 int) table
+    """
+    table = _tables.get(cipher)
+    if table is None:
+        table = _tables[cipher] = _shoup_table(cipher.encrypt_block(bytes(16)))
+    return table
+
+class GHASH:
+    """
+    GHASH universal hash for a hash key H. Elements of F_2^128 are ints, the first
+    byte of a block being the most significant
+    - attributes : (int) y, current value
+    - methods : *init, update, pad, digest
+    """
+
+    def __init__(self, H=None, table=None):
+        """
+        Precomputes the products of H by all the elements of degree < 8, unless given
+        - input: (bytes, 16 B) H, or (list of 256 int) table from _shoup_table, shared and not modified
+        """
+        self._table = _shoup_table(H) if (table is None) else table
+        self.y = 0
+        self._buf = b''
+
+    def _mul_h(self, x):
+        """
+        Multiplication by H, Horner's scheme on the bytes of x, last byte first
+        """
+        table, R8 = self._table, _R8
+        z = 0
+        for k in range(0, 128, 8):
+            z = (z >> 8) ^ R8[z & 0xff] ^ table[(x >> k) & 0xff]
+        return z
+
+    def update(self, data):
+        """
+        Absorbs data, an incomplete block is kept for the next call
+        - input: (bytes) data
+        - output: None
+        """
+        data = self._buf + bytes(data)
+        end = len(data) - len(data) % BLOCK_SIZE
+        y, mul_h = self.y, self._mul_h
+        for k in range(0, end, BLOCK_SIZE):
+            y = mul_h(y ^ int.from_bytes(data[k:k+BLOCK_SIZE], 'big'))
+        self.y = y
+        self._buf = data[end:]
+
+    def pad(self):
+        """
+        Completes the pending block with zeros
+        - output: None
+        """
+        if self._buf:
+            self.update(bytes(BLOCK_SIZE - len(self._buf)))
+
+    def digest(self):
+        """
+        Value of the hash, the pending block is padded
+        - output: (bytes, 16 B) no name
+        """
+        self.pad()
+        return self.y.to_bytes(16, 'big')
+
+class GCM:
+    """
+    Galois/Counter Mode for one message: associated data first, then the encryption
+    or decryption of the message in any number of calls, then the tag
+    - attributes : (AES object) cipher, (bytes) iv, (int) tag_length
+    - methods : *init, update, encrypt, decrypt, digest, verify, encrypt_and_digest, decrypt_and_verify
+    """
+
+    def __init__(self, key, iv, tag_length=16):
+        """
+        - input: (bytes or AES object) key, (bytes) iv, 12 bytes recommended, any non-empty length accepted,
+                 (int) tag_length in bytes, 4 to 16
+        """
+        try:
+            assert len(iv) > 0
+        except AssertionError:
+            raise ValueError("IV should not be empty.")
+        try:
+            assert 4 <= tag_length <= 16
+        except AssertionError:
+            raise ValueError("Tag length should be between 4 and 16 bytes.")
+        self.cipher = get_cipher(key)
+        self.iv = bytes(iv)
+        self.tag_length = tag_length
+        self._ghash = GHASH(table=_cipher_table(self.cipher))
+
+        if len(iv) == 12:
+            j0 = self.iv + b'\x00\x00\x00\x01'
+        else:
+            # J0 = GHASH(iv, zero padding, 64-bit length of iv in bits on 128 bits)
+            ghash = self._ghash
+            ghash.update(self.iv)
+            ghash.pad()
+            ghash.update((8*len(iv)).to_bytes(16, 'big'))
+            j0 = ghash.y.to_bytes(16, 'big')
+            ghash.y = 0
+        self._tag_mask = self.cipher.encrypt_block(j0)
+        self._prefix = j0[:12]
+        self._counter = (int.from_bytes(j0[12:], 'big') + 1) & 0xffffffff
+        self._ks = b''
+        self._tag = None
+        self._aad_len = 0
+        self._msg_len = 0
+        self._state = "aad"
+        self._decrypting = None
+
+    def update(self, aad):
+        """
+        Authenticates associated data, before any encryption or decryption
+        - input: (bytes) aad
+        - output: None
+        """
+        if self._state != "aad":
+            raise TypeError("Associated data must be given before the message.")
+        self._ghash.update(aad)
+        self._aad_len += len(aad)
+
+    def _keystream(self, n):
+        """
+        Next n bytes of keystream, the counter is incremented on its last 32 bits
+        """
+        ks = self._ks
+        if len(ks) < n:
+            nblocks = (n - len(ks) + BLOCK_SIZE - 1) // BLOCK_SIZE
+            prefix, counter = self._prefix, self._counter
+            counters = b''.join([prefix + ((counter + k) & 0xffffffff).to_bytes(4, 'big') for k in range(nblocks)])
+            ks += self.cipher.encrypt_blocks(counters)
+            self._counter = (counter + nblocks) & 0xffffffff
+        self._ks = ks[n:]
+        return ks[:n]
+
+    def _start(self, decrypting):
+        if self._state == "aad":
+            self._ghash.pad()
+            self._state = "message"
+            self._decrypting = decrypting
+        elif (self._state != "message") or (self._decrypting != decrypting):
+            raise TypeError("Encryption and decryption cannot be mixed, nor follow the tag.")
+
+    def encrypt(self, data):
+        """
+        Encryption of a piece of the message
+        - input: (bytes) data
+        - output: (bytes) ciphertext
+        """
+        self._start(False)
+        out = xor_bytes(bytes(data), self._keystream(len(data)))
+        self._ghash.update(out)
+        self._msg_len += len(data)
+        return out
+
+    def decrypt(self, data):
+        """
+        Decryption of a piece of the message. The plaintext must not be used before verify succeeds
+        - input: (bytes) data
+        - output: (bytes) plaintext
+        """
+        self._start(True)
+        data = bytes(data)
+        self._ghash.update(data)
+        self._msg_len += len(data)
+        return xor_bytes(data, self._keystream(len(data)))
+
+    def digest(self):
+        """
+        Authentication tag, ends the message
+        - output: (bytes) tag
+        """
+        if self._state != "done":
+            self._ghash.pad()
+            self._ghash.update((8*self._aad_len).to_bytes(8, 'big') + (8*self._msg_len).to_bytes(8, 'big'))
+            self._tag = xor_bytes(self._ghash.digest(), self._tag_mask)[:self.tag_length]
+            self._state = "done"
+        return self._tag
+
+    def verify(self, tag):
+        """
+        Checks a tag in constant time
+        - input: (bytes) tag
+        - output: None, raises ValueError if the tag is wrong
+        """
+        if not hmac.compare_digest(self.digest(), bytes(tag)):
+            raise ValueError("MAC check failed.")
+
+    def encrypt_and_digest(self, data):
+        """
+        - input: (bytes) data
+        - output: (tuple) ciphertext, tag
+        """
+        return self.encrypt(data), self.digest()
+
+    def decrypt_and_verify(self, data, tag):
+        """
+        - input: (bytes) data, (bytes) tag
+        - output: (bytes) plaintext, raises ValueError if the tag is wrong
+        """
+        plaintext = self.decrypt(data)
+        self.verify(tag)
+        return plaintext
+
+def gcm_encrypt(data, key, iv, aad=b'', tag_length=16):
+    """
+    GCM encryption
+    - input: (bytes) data, (bytes or AES object) key, (bytes) iv, (bytes) aad, (int) tag_length
+    - output: (tuple) ciphertext, tag
+    """
+    mode = GCM(key, iv, tag_length)
+    mode.update(aad)
+    return mode.encrypt_and_digest(data)
+
+def gcm_decrypt(data, key, iv, tag, aad=b''):
+    """
+    GCM decryption, the tag length is the length of tag
+    - input: (bytes) data, (bytes or AES object) key, (bytes) iv, (bytes) tag, (bytes) aad
+    - output: (bytes) plaintext, raises ValueError if the tag is wrong
+    """
+    mode = GCM(key, iv, len(tag))
+    mode.update(aad)
+    return mode.decrypt_and_verify(data, tag)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Bounded LRU cache of expanded key schedules for AES Cipher
+"""
+
+#-- Import --#
+import collections
+import contextlib
+import threading
+from byte import *
+#- End Import -#
+
+def zeroize(schedule):
+    """
+    Overwrites a key schedule with zeros (best effort, Python ints are immutable)
+    - input: (list, tuple, bytearray, NumPy array, ByteMatrix, FlatByteMatrix or object with a zeroize
+             method) schedule
+    - output: None, raises TypeError if the schedule cannot be overwritten
+    """
+    if type(schedule) == ByteMatrix:
+        for row in schedule.arr:
+            for j in range(len(row)):
+                row[j] = Byte(0)
+    elif type(schedule) == FlatByteMatrix:
+        # Rows and columns are views on the buffer of their matrix, the whole buffer is wiped
+        schedule.buf[:] = bytes(len(schedule.buf))
+    elif type(schedule) == bytearray:
+        schedule[:] = bytes(len(schedule))
+    elif hasattr(schedule, "fill"):
+        # NumPy arrays
+        schedule.fill(0)
+    elif hasattr(schedule, "zeroize"):
+        # Schedules wiping themselves, such as compiled.CompiledSchedule
+        schedule.zeroize()
+    elif type(schedule) in (list, tuple):
+        if (type(schedule) == tuple) and any([type(elt) == int for elt in schedule]):
+            raise TypeError("A tuple of ints cannot be zeroized.")
+        for k, elt in enumerate(schedule):
+            if type(elt) == int:
+                schedule[k] = 0
+            else:
+                zeroize(elt)
+    else:
+        raise TypeError("A schedule of type {} cannot be zeroized.".format(type(schedule).__name__))
+
+class _Entry:
+    """
+    Cached schedule with its number of active leases
+    """
+    __slots__ = ("schedule", "leases", "evicted")
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.leases = 0
+        self.evicted = False
+
+class KeyScheduleCache:
+    """
+    Process-wide LRU cache of key schedules, keyed by (backend, key bytes)
+    - attributes : (int) capacity, (int) hits, (int) misses, (int) evictions
+    - methods : *init, *len, lease, clear, stats
+    """
+
+    def __init__(self, capacity=128):
+        """
+        Default capacity of 128 schedules, a capacity of 0 disables caching
+        """
+        self._entries = collections.OrderedDict()
+        # Events of the keys being expanded, set once the schedule is cached or the expansion failed
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._capacity = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        try:
+            assert (type(capacity) == int) and (capacity >= 0)
+        except AssertionError:
+            raise ValueError("Capacity must be a non-negative integer.")
+        with self._lock:
+            self._capacity = capacity
+            self._trim()
+
+    def _evict(self, entry):
+        """
+        Marks an entry as evicted, it is zeroized once no lease holds it anymore
+        """
+        entry.evicted = True
+        self.evictions += 1
+        if entry.leases == 0:
+            zeroize(entry.schedule)
+
+    def _trim(self):
+        while len(self._entries) > self._capacity:
+            self._evict(self._entries.popitem(last=False)[1])
+
+    @contextlib.contextmanager
+    def lease(self, key, backend, expand):
+        """
+        Context manager yielding the schedule of a key, expanding it on a miss. The key is
+        expanded outside the lock, concurrent misses on the same key wait for one expansion
+        - input: (bytes) key, (str) backend, (function) expand taking the key
+        - output: (object) schedule, valid until the end of the with block
+        """
+        try:
+            assert type(key) == bytes
+        except AssertionError:
+            raise TypeError("Key must be of type bytes (built-in)")
+        while True:
+            with self._lock:
+                entry = self._entries.get((backend, key))
+                if entry is not None:
+                    self.hits += 1
+                    self._entries.move_to_end((backend, key))
+                    entry.leases += 1
+                    break
+                pending = self._pending.get((backend, key))
+                if pending is None:
+                    self.misses += 1
+                    event = self._pending[(backend, key)] = threading.Event()
+            if pending is not None:
+                # Another thread is expanding the key, the lookup is done again once it is over
+                pending.wait()
+                continue
+            try:
+                schedule = expand(key)
+            except BaseException:
+                with self._lock:
+                    del self._pending[(backend, key)]
+                event.set()
+                raise
+            with self._lock:
+                del self._pending[(backend, key)]
+                entry = self._entries[(backend, key)] = _Entry(schedule)
+                entry.leases += 1
+                self._trim()
+            event.set()
+            break
+        try:
+            yield entry.schedule
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                if entry.evicted and entry.leases == 0:
+                    zeroize(entry.schedule)
+
+    def clear(self):
+        """
+        Evicts and zeroizes every cached schedule, counters are kept
+        - output: None
+        """
+        with self._lock:
+            while self._entries:
+                self._evict(self._entries.popitem(last=False)[1])
+
+    def stats(self):
+        """
+        Returns the counters of the cache
+        - output: (dict) no name
+        """
+        with self._lock:
+            return {"capacity": self._capacity, "size": len(self._entries), "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+# Cache shared by Enc and Dec
+schedule_cache = KeyScheduleCache()
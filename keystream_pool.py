@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: CTR and OFB keystream generated ahead of time by a background thread for AES Cipher.
+           Encrypting a message taken from the pool is a single XOR.
+"""
+
+#-- Import --#
+import threading
+from modes import *
+#- End Import -#
+
+class KeystreamPool:
+    """
+    Keystream of one CTR or OFB stream, pre-generated by a background thread.
+    Slices are handed out in order, the pool is refilled to capacity when it
+    drops below the low-water mark.
+    - attributes : (AES object) cipher, (str) mode, (int) capacity, (int) low_water, (int) chunk_blocks
+    - methods : *init, *enter, *exit, available, take, encrypt, decrypt, close
+    """
+
+    def __init__(self, key, iv, mode="ctr", capacity=4096, low_water=None, chunk_blocks=256):
+        """
+        - input: (bytes or AES object) key, (bytes, 16 B) iv, (str) mode "ctr" or "ofb",
+                 (int) capacity in blocks, (int) low_water in blocks (default: capacity // 4),
+                 (int) chunk_blocks generated at once by the thread
+        """
+        try:
+            assert mode in ("ctr", "ofb")
+        except AssertionError:
+            raise ValueError("Mode should be 'ctr' or 'ofb'.")
+        try:
+            assert (type(capacity) == int) and (capacity > 0) and (type(chunk_blocks) == int) and (chunk_blocks > 0)
+        except AssertionError:
+            raise ValueError("Capacity and chunk size must be positive integers.")
+        self.cipher = get_cipher(key)
+        self.mode = mode
+        self.capacity = capacity
+        self.low_water = capacity // 4 if (low_water is None) else low_water
+        self.chunk_blocks = chunk_blocks
+
+        # Only the refill thread touches the generator state
+        self._counter = initial_counter(iv)
+        self._iv = self._counter.to_bytes(BLOCK_SIZE, 'big')
+
+        self._buf = bytearray()
+        self._start = 0
+        # Sum of the bytes asked by the readers waiting in take
+        self._wanted = 0
+        self._closed = False
+        self._error = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._refill, name="KeystreamPool", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _generate(self, nblocks):
+        """
+        Next nblocks blocks of keystream
+        """
+        ks = bytearray(BLOCK_SIZE*nblocks)
+        if self.mode == "ctr":
+            ctr_keystream_into(self.cipher, self._counter, nblocks, ks)
+            self._counter = (self._counter + nblocks) & COUNTER_MASK
+        else:
+            iv = self._iv
+            for k in range(0, len(ks), BLOCK_SIZE):
+                self.cipher.encrypt_into(iv, 0, ks, k)
+                iv = ks[k:k+BLOCK_SIZE]
+            self._iv = bytes(iv)
+        return ks
+
+    def _refill(self):
+        cond = self._cond
+        while True:
+            with cond:
+                # Sleeps until the pool is below the low-water mark or a reader is waiting
+                while not self._closed and (self.available() >= max(BLOCK_SIZE*self.low_water, 1)
+                                            and self.available() >= self._wanted):
+                    cond.wait()
+                if self._closed:
+                    return
+                target = max(BLOCK_SIZE*self.capacity, self._wanted)
+            while True:
+                try:
+                    ks = self._generate(self.chunk_blocks)
+                except Exception as error:
+                    with cond:
+                        self._error = error
+                        cond.notify_all()
+                    return
+                with cond:
+                    if self._closed:
+                        return
+                    if self._start > len(self._buf) // 2:
+                        del self._buf[:self._start]
+                        self._start = 0
+                    self._buf += ks
+                    cond.notify_all()
+                    if self.available() >= max(target, self._wanted):
+                        break
+
+    def available(self):
+        """
+        Number of keystream bytes ready
+        - output: (int) no name
+        """
+        return len(self._buf) - self._start
+
+    def take(self, n):
+        """
+        Next n bytes of keystream, waits for the refill thread when the pool runs dry
+        - input: (int) n
+        - output: (bytes) no name
+        """
+        with self._cond:
+            if self.available() < n:
+                self._wanted += n
+                self._cond.notify_all()
+                try:
+                    while (self.available() < n) and not self._closed and (self._error is None):
+                        self._cond.wait()
+                finally:
+                    self._wanted -= n
+            if self.available() < n:
+                if self._error is not None:
+                    raise self._error
+                raise ValueError("Keystream pool is closed.")
+            ks = bytes(self._buf[self._start:self._start+n])
+            self._start += n
+            if self.available() < BLOCK_SIZE*self.low_water:
+                self._cond.notify_all()
+            return ks
+
+    def encrypt(self, data):
+        """
+        Encryption of data of any length with the next bytes of keystream
+        - input: (bytes) data
+        - output: (bytes) no name
+        """
+        return xor_bytes(bytes(data), self.take(len(data)))
+
+    def decrypt(self, data):
+        """
+        Decryption of data of any length with the next bytes of keystream
+        - input: (bytes) data
+        - output: (bytes) no name
+        """
+        return xor_bytes(bytes(data), self.take(len(data)))
+
+    def close(self):
+        """
+        Stops the refill thread and drops the keystream left
+        - output: None
+        """
+        with self._cond:
+            self._closed = True
+            self._buf[:] = bytes(len(self._buf))
+            self._buf = bytearray()
+            self._start = 0
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
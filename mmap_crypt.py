@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: CTR encryption of files through memory maps for AES Cipher.
+           Usage: python mmap_crypt.py INPUT [-o OUTPUT] --key HEX --iv HEX [--start-block N]
+           Encryption and decryption are the same operation in CTR mode.
+"""
+
+#-- Import --#
+import argparse
+import mmap
+import os
+import time
+from aes_functions import BACKENDS
+from modes import *
+#- End Import -#
+
+# Default size of the mapped windows (16 MiB), rounded to the allocation granularity
+WINDOW_SIZE = 1 << 24
+
+def _granular(size):
+    """
+    Rounds a window size up to a multiple of the mmap allocation granularity (itself a multiple of 16)
+    """
+    gran = mmap.ALLOCATIONGRANULARITY
+    return max(gran, (size + gran - 1) // gran * gran)
+
+def crypt_file(src, key, iv, dst=None, start_block=0, window=WINDOW_SIZE, backend="ttable"):
+    """
+    CTR encryption (and decryption) of a file, in place or into dst, window by window
+    - input: (str) src path, (bytes or AES object) key, (bytes, 16 B) iv initial counter block,
+             (str) dst path (default: in place), (int) start_block to resume from, the data before
+             16*start_block bytes is left untouched, (int) window size in bytes, (str) backend
+    - output: (dict) bytes processed, seconds and MB/s
+    """
+    cipher = key if isinstance(key, AES) else AES(key, backend)
+    counter = initial_counter(iv)
+    window = _granular(window)
+    size = os.path.getsize(src)
+    start = BLOCK_SIZE*start_block
+    try:
+        assert (type(start_block) == int) and (0 <= start <= size)
+    except AssertionError:
+        raise ValueError("Start block must be within the file.")
+    in_place = (dst is None) or (os.path.exists(dst) and os.path.samefile(src, dst))
+
+    t0 = time.perf_counter()
+    fin = open(src, "r+b" if in_place else "rb")
+    try:
+        if in_place:
+            fout = fin
+        else:
+            # An existing output is kept to resume an interrupted run
+            fout = open(dst, "r+b" if os.path.exists(dst) else "w+b")
+            fout.truncate(size)
+        pos = start
+        keystream = bytearray(window)
+        while pos < size:
+            length = min(window, size - pos)
+            # Map offsets must be multiples of the allocation granularity
+            base = pos - pos % mmap.ALLOCATIONGRANULARITY
+            lo, hi = pos - base, pos - base + length
+            in_map = mmap.mmap(fin.fileno(), hi, offset=base,
+                               access=mmap.ACCESS_WRITE if in_place else mmap.ACCESS_READ)
+            out_map = in_map if in_place else mmap.mmap(fout.fileno(), hi, offset=base, access=mmap.ACCESS_WRITE)
+            try:
+                nblocks = (length + BLOCK_SIZE - 1) // BLOCK_SIZE
+                ctr_keystream_into(cipher, counter + pos // BLOCK_SIZE, nblocks, keystream)
+                # The views are released before the maps are closed
+                with memoryview(in_map) as src, memoryview(out_map) as dst:
+                    xor_into(src[lo:hi], keystream, dst[lo:hi], length)
+                out_map.flush()
+            finally:
+                if not in_place:
+                    out_map.close()
+                in_map.close()
+            pos += length
+    finally:
+        if not in_place:
+            fout.close()
+        fin.close()
+    seconds = time.perf_counter() - t0
+    processed = size - start
+    return {"bytes": processed, "seconds": seconds,
+            "MB_per_s": processed / seconds / 1e6 if seconds else 0.0}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AES-CTR encryption/decryption of a file through mmap.")
+    parser.add_argument("input", help="file to encrypt or decrypt")
+    parser.add_argument("-o", "--output", help="output file (default: in place)")
+    parser.add_argument("--key", required=True, help="key, hexadecimal")
+    parser.add_argument("--iv", required=True, help="initial counter block, 16 bytes hexadecimal")
+    parser.add_argument("--start-block", type=int, default=0, help="block to resume from")
+    parser.add_argument("--window", type=int, default=WINDOW_SIZE, help="mapped window size in bytes")
+    parser.add_argument("--backend", default="ttable", choices=BACKENDS, help="cipher backend")
+    args = parser.parse_args(argv)
+
+    stats = crypt_file(args.input, bytes.fromhex(args.key), bytes.fromhex(args.iv), args.output,
+                       args.start_block, args.window, args.backend)
+    print("[+] {} bytes in {:.3f} s ({:.2f} MB/s)".format(stats["bytes"], stats["seconds"], stats["MB_per_s"]))
+    return stats
+
+if __name__ == '__main__':
+    main()
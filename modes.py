@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Modes of operation (ECB, CBC, CFB, OFB, CTR) and PKCS#7 padding for AES Cipher
+"""
+
+#-- Import --#
+from cipher import AES
+import numpy_backend
+#- End Import -#
+
+BLOCK_SIZE = 16
+COUNTER_MASK = (1 << 128) - 1
+# Pieces of xor_into without NumPy, the size of its temporaries (64 KiB)
+XOR_CHUNK = 1 << 16
+
+def xor_bytes(a, b):
+    """
+    XOR of two byte strings of the same length
+    - input: (bytes) a, (bytes) b
+    - output: (bytes) no name
+    """
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+def xor_into(a, b, out, length=None):
+    """
+    XOR of two buffers into a writable buffer, which may be a itself. With NumPy the
+    buffers are XORed in place, without NumPy by pieces of XOR_CHUNK bytes
+    - input: (buffer) a, (buffer) b, (writable buffer) out, (int) length, default len(a)
+    - output: None
+    """
+    a, b, out = memoryview(a).cast('B'), memoryview(b).cast('B'), memoryview(out).cast('B')
+    if length is None:
+        length = len(a)
+    if numpy_backend._load():
+        np = numpy_backend.np
+        np.bitwise_xor(np.frombuffer(a, dtype=np.uint8, count=length), np.frombuffer(b, dtype=np.uint8, count=length),
+                       out=np.frombuffer(out, dtype=np.uint8, count=length))
+        return
+    for k in range(0, length, XOR_CHUNK):
+        end = min(k + XOR_CHUNK, length)
+        out[k:end] = xor_bytes(a[k:end], b[k:end])
+
+def pkcs7_pad(data, block_size=BLOCK_SIZE):
+    """
+    PKCS#7 padding, a full block is added when data is aligned
+    - input: (bytes) data, (int) block_size
+    - output: (bytes) no name
+    """
+    k = block_size - len(data) % block_size
+    return bytes(data) + bytes([k])*k
+
+def pkcs7_unpad(data, block_size=BLOCK_SIZE):
+    """
+    Removes PKCS#7 padding
+    - input: (bytes) data
+    - output: (bytes) no name
+    """
+    try:
+        assert (len(data) != 0) and (len(data) % block_size == 0)
+        k = data[-1]
+        assert 1 <= k <= block_size
+        assert data[-k:] == bytes([k])*k
+    except AssertionError:
+        raise ValueError("Invalid padding.")
+    return bytes(data[:-k])
+
+def get_cipher(key):
+    """
+    Returns an AES object, keys are expanded once per call of the modes
+    - input: (bytes or AES object) key
+    - output: (AES object) no name
+    """
+    if isinstance(key, AES):
+        return key
+    return AES(key)
+
+def _check_iv(iv):
+    try:
+        assert len(iv) == BLOCK_SIZE
+    except AssertionError:
+        raise ValueError("IV should be 16 bytes.")
+    return bytes(iv)
+
+def initial_counter(iv):
+    """
+    Checks an initial counter block of CTR, for the modules deriving the counters themselves
+    - input: (bytes, 16 B) iv
+    - output: (int) counter, the block as a 128-bit big-endian integer
+    """
+    return int.from_bytes(_check_iv(iv), 'big')
+
+def _check_aligned(data):
+    try:
+        assert len(data) % BLOCK_SIZE == 0
+    except AssertionError:
+        raise ValueError("Data should be a multiple of 16 bytes. Use padding.")
+
+class ECB:
+    """
+    Electronic codebook mode on whole blocks
+    - attributes : (AES object) cipher
+    - methods : *init, encrypt, decrypt
+    """
+
+    def __init__(self, key):
+        self.cipher = get_cipher(key)
+
+    def encrypt(self, data):
+        """
+        Encryption of whole blocks
+        - input: (bytes, multiple of 16 B) data
+        - output: (bytes) no name
+        """
+        _check_aligned(data)
+        return self.cipher.encrypt_blocks(data)
+
+    def decrypt(self, data):
+        """
+        Decryption of whole blocks
+        - input: (bytes, multiple of 16 B) data
+        - output: (bytes) no name
+        """
+        _check_aligned(data)
+        return self.cipher.decrypt_blocks(data)
+
+    def encrypt_into(self, data, out, offset=0):
+        """
+        Encryption of whole blocks into a writable buffer at an offset
+        - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        _check_aligned(data)
+        return self.cipher.encrypt_blocks_into(data, out, offset)
+
+    def decrypt_into(self, data, out, offset=0):
+        """
+        Decryption of whole blocks into a writable buffer at an offset
+        - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        _check_aligned(data)
+        return self.cipher.decrypt_blocks_into(data, out, offset)
+
+class CBC:
+    """
+    Cipher block chaining mode on whole blocks, the chaining value is kept between calls
+    - attributes : (AES object) cipher, (bytes) iv
+    - methods : *init, encrypt, decrypt
+    """
+
+    def __init__(self, key, iv):
+        self.cipher = get_cipher(key)
+        self.iv = _check_iv(iv)
+
+    def encrypt(self, data):
+        """
+        Encryption of whole blocks
+        - input: (bytes, multiple of 16 B) data
+        - output: (bytes) no name
+        """
+        _check_aligned(data)
+        enc, prev, out = self.cipher.encrypt_block, self.iv, []
+        for k in range(0, len(data), 16):
+            prev = enc(xor_bytes(data[k:k+16], prev))
+            out.append(prev)
+        self.iv = prev
+        return b''.join(out)
+
+    def decrypt(self, data):
+        """
+        Decryption of whole blocks
+        - input: (bytes, multiple of 16 B) data
+        - output: (bytes) no name
+        """
+        _check_aligned(data)
+        dec, prev, out = self.cipher.decrypt_block, self.iv, []
+        for k in range(0, len(data), 16):
+            block = bytes(data[k:k+16])
+            out.append(xor_bytes(dec(block), prev))
+            prev = block
+        self.iv = prev
+        return b''.join(out)
+
+    def encrypt_into(self, data, out, offset=0):
+        """
+        Encryption of whole blocks into a writable buffer at an offset, each block is
+        XORed and encrypted in place in out
+        - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        _check_aligned(data)
+        src, dst = memoryview(data).cast('B'), memoryview(out).cast('B')
+        enc_into, prev = self.cipher.encrypt_into, self.iv
+        for k in range(0, len(src), 16):
+            o = offset + k
+            dst[o:o+16] = xor_bytes(src[k:k+16], prev)
+            enc_into(dst, o, dst, o)
+            prev = dst[o:o+16]
+        self.iv = bytes(prev)
+        return len(src)
+
+    def decrypt_into(self, data, out, offset=0):
+        """
+        Decryption of whole blocks into a writable buffer at an offset, which must not
+        overlap data: the blocks are decrypted at once, then XORed with the previous ones
+        - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        _check_aligned(data)
+        src, dst = memoryview(data).cast('B'), memoryview(out).cast('B')
+        n = len(src)
+        if n:
+            self.cipher.decrypt_blocks_into(src, dst, offset)
+            xor_into(dst[offset:offset+16], self.iv, dst[offset:offset+16])
+            xor_into(dst[offset+16:offset+n], src[:n-16], dst[offset+16:offset+n])
+            self.iv = bytes(src[n-16:])
+        return n
+
+class _SegmentMode:
+    """
+    Stream modes: data of any length is XORed with keystream segments of 16 bytes,
+    a partially used segment is carried over to the next call
+    """
+
+    def __init__(self, key, iv):
+        self.cipher = get_cipher(key)
+        self.iv = _check_iv(iv)
+        self._ks = b''
+        self._pos = BLOCK_SIZE
+
+    def _next_keystream(self):
+        raise NotImplementedError
+
+    def _feed(self, data_in, data_out):
+        """
+        Called with each processed piece, for modes whose keystream depends on the data
+        """
+        pass
+
+    def _process(self, data):
+        out = []
+        i, length = 0, len(data)
+        while i < length:
+            if self._pos == BLOCK_SIZE:
+                self._ks = self._next_keystream()
+                self._pos = 0
+            take = min(BLOCK_SIZE - self._pos, length - i)
+            piece = bytes(data[i:i+take])
+            res = xor_bytes(piece, self._ks[self._pos:self._pos+take])
+            self._feed(piece, res)
+            out.append(res)
+            self._pos += take
+            i += take
+        return b''.join(out)
+
+    def encrypt(self, data):
+        """
+        Encryption of data of any length
+        - input: (bytes) data
+        - output: (bytes) no name
+        """
+        return self._process(data)
+
+    def decrypt(self, data):
+        """
+        Decryption of data of any length
+        - input: (bytes) data
+        - output: (bytes) no name
+        """
+        return self._process(data)
+
+    def encrypt_into(self, data, out, offset=0):
+        """
+        Encryption into a writable buffer at an offset, the keystream depends on the
+        previous segment so the output is computed then copied
+        - input: (bytes) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        result = self.encrypt(data)
+        memoryview(out).cast('B')[offset:offset+len(result)] = result
+        return len(result)
+
+    def decrypt_into(self, data, out, offset=0):
+        """
+        Decryption into a writable buffer at an offset, see encrypt_into
+        - input: (bytes) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        result = self.decrypt(data)
+        memoryview(out).cast('B')[offset:offset+len(result)] = result
+        return len(result)
+
+class CFB(_SegmentMode):
+    """
+    Cipher feedback mode with 128-bit segments
+    - attributes : (AES object) cipher, (bytes) iv
+    - methods : *init, encrypt, decrypt
+    """
+
+    def __init__(self, key, iv):
+        _SegmentMode.__init__(self, key, iv)
+        self._segment = []
+        self._decrypting = False
+
+    def _next_keystream(self):
+        if self._segment:
+            self.iv = b''.join(self._segment)
+            self._segment = []
+        return self.cipher.encrypt_block(self.iv)
+
+    def _feed(self, data_in, data_out):
+        # The feedback is always the ciphertext
+        self._segment.append(data_in if self._decrypting else data_out)
+
+    def encrypt(self, data):
+        self._decrypting = False
+        return self._process(data)
+
+    def decrypt(self, data):
+        self._decrypting = True
+        return self._process(data)
+
+class OFB(_SegmentMode):
+    """
+    Output feedback mode
+    - attributes : (AES object) cipher, (bytes) iv
+    - methods : *init, encrypt, decrypt
+    """
+
+    def _next_keystream(self):
+        self.iv = self.cipher.encrypt_block(self.iv)
+        return self.iv
+
+class CTR(_SegmentMode):
+    """
+    Counter mode, the 16-byte iv is the initial counter block, incremented as a
+    128-bit big-endian integer
+    - attributes : (AES object) cipher, (bytes) iv, (int) counter
+    - methods : *init, encrypt, decrypt
+    """
+
+    def __init__(self, key, iv):
+        _SegmentMode.__init__(self, key, iv)
+        self.counter = int.from_bytes(self.iv, 'big')
+
+    def _next_keystream(self):
+        block = self.counter.to_bytes(16, 'big')
+        self.counter = (self.counter + 1) & COUNTER_MASK
+        return self.cipher.encrypt_block(block)
+
+    def _process(self, data):
+        """
+        The keystream of all the blocks needed is computed in one batch
+        """
+        out = []
+        if self._pos < BLOCK_SIZE:
+            take = min(BLOCK_SIZE - self._pos, len(data))
+            out.append(_SegmentMode._process(self, data[:take]))
+            data = data[take:]
+        if len(data):
+            nblocks = (len(data) + BLOCK_SIZE - 1) // BLOCK_SIZE
+            ks = bytearray(BLOCK_SIZE*nblocks)
+            ctr_keystream_into(self.cipher, self.counter, nblocks, ks)
+            self.counter = (self.counter + nblocks) & COUNTER_MASK
+            out.append(xor_bytes(bytes(data), ks[:len(data)]))
+            self._ks = bytes(ks[-BLOCK_SIZE:])
+            self._pos = len(data) - BLOCK_SIZE*(nblocks - 1)
+        return b''.join(out)
+
+    def encrypt_into(self, data, out, offset=0):
+        """
+        Encryption into a writable buffer at an offset. The keystream is computed by pieces
+        of XOR_CHUNK bytes in a scratch buffer, so out is only written within
+        [offset, offset + len(data)) and data may be a view on out (in place)
+        - input: (buffer) data, (writable buffer) out, (int) offset
+        - output: (int) number of bytes written
+        """
+        src, dst = memoryview(data).cast('B'), memoryview(out).cast('B')
+        n, i = len(src), 0
+        if self._pos < BLOCK_SIZE:
+            i = min(BLOCK_SIZE - self._pos, n)
+            dst[offset:offset+i] = xor_bytes(src[:i], self._ks[self._pos:self._pos+i])
+            self._pos += i
+        if i < n:
+            scratch = memoryview(bytearray(min(XOR_CHUNK, n - i + BLOCK_SIZE - 1) // BLOCK_SIZE * BLOCK_SIZE))
+        while i < n:
+            take = min(len(scratch), n - i)
+            nblocks = (take + BLOCK_SIZE - 1) // BLOCK_SIZE
+            ks = scratch[:BLOCK_SIZE*nblocks]
+            ctr_keystream_into(self.cipher, self.counter, nblocks, ks)
+            self.counter = (self.counter + nblocks) & COUNTER_MASK
+            xor_into(src[i:i+take], ks, dst[offset+i:offset+i+take], take)
+            # Only the last piece can end inside a block
+            self._ks = bytes(ks[-BLOCK_SIZE:])
+            self._pos = take - BLOCK_SIZE*(nblocks - 1)
+            i += take
+        return n
+
+    def decrypt_into(self, data, out, offset=0):
+        """
+        Decryption into a writable buffer at an offset, the same as encrypt_into
+        """
+        return self.encrypt_into(data, out, offset)
+
+def ctr_keystream_into(cipher, counter, nblocks, out, offset=0):
+    """
+    Writes the CTR keystream of nblocks consecutive counter values into a buffer
+    - input: (AES object) cipher, (int) counter value of the first block, (int) nblocks,
+             (writable buffer) out, (int) offset
+    - output: (int) number of bytes written
+    """
+    counters = b''.join([((counter + k) & COUNTER_MASK).to_bytes(16, 'big') for k in range(nblocks)])
+    return cipher.encrypt_blocks_into(counters, out, offset)
+
+MODES = {"ecb": ECB, "cbc": CBC, "cfb": CFB, "ofb": OFB, "ctr": CTR}
+
+def ecb_encrypt(data, key, padding=True):
+    """
+    ECB encryption of a whole message
+    - input: (bytes) data, (bytes or AES object) key, (bool) padding with PKCS#7
+    - output: (bytes) ciphertext
+    """
+    return ECB(key).encrypt(pkcs7_pad(data) if padding else data)
+
+def ecb_decrypt(data, key, padding=True):
+    """
+    ECB decryption of a whole message
+    - input: (bytes) data, (bytes or AES object) key, (bool) padding with PKCS#7
+    - output: (bytes) plaintext
+    """
+    plaintext = ECB(key).decrypt(data)
+    return pkcs7_unpad(plaintext) if padding else plaintext
+
+def cbc_encrypt(data, key, iv, padding=True):
+    """
+    CBC encryption of a whole message
+    - input: (bytes) data, (bytes or AES object) key, (bytes, 16 B) iv, (bool) padding with PKCS#7
+    - output: (bytes) ciphertext
+    """
+    return CBC(key, iv).encrypt(pkcs7_pad(data) if padding else data)
+
+def cbc_decrypt(data, key, iv, padding=True):
+    """
+    CBC decryption of a whole message
+    - input: (bytes) data, (bytes or AES object) key, (bytes, 16 B) iv, (bool) padding with PKCS#7
+    - output: (bytes) plaintext
+    """
+    plaintext = CBC(key, iv).decrypt(data)
+    return pkcs7_unpad(plaintext) if padding else plaintext
+
+def cfb_encrypt(data, key, iv):
+    """
+    CFB encryption of a message of any length
+    - input: (bytes) data, (bytes or AES object) key, (bytes, 16 B) iv
+    - output: (bytes) ciphertext
+    """
+    return CFB(key, iv).encrypt(data)
+
+def cfb_decrypt(data, key, iv):
+    """
+    CFB decryption of a message of any length
+    - input: (bytes) data, (bytes or AES object) key, (bytes, 16 B) iv
+    - output: (bytes) plaintext
+    """
+    return CFB(key, iv).decrypt(data)
+
+def ofb_encrypt(data, key, iv):
+    """
+    OFB encryption (and decryption) of a message of any length
+    - input: (bytes) data, (bytes or AES object) key, (bytes, 16 B) iv
+    - output: (bytes) no name
+    """
+    return OFB(key, iv).encrypt(data)
+
+ofb_decrypt = ofb_encrypt
+
+def ctr_encrypt(data, key, iv):
+    """
+    CTR encryption (and decryption) of a message of any length
+    - input: (bytes) data, (bytes or AES object) key, (bytes, 16 B) iv initial counter block
+    - output: (bytes) no name
+    """
+    return CTR(key, iv).encrypt(data)
+
+ctr_decrypt = ctr_encrypt
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: NumPy engine encrypting many blocks at once for AES Cipher.
+           Without NumPy, the ttable engine is used block by block.
+           NumPy is only imported when the engine is first used.
+"""
+
+#-- Import --#
+from constants import *
+import ttable
+import table_cache
+#- End Import -#
+
+def _mul_table(coef):
+    """
+    Table of the products coef * x for x in F_256
+    """
+    return [(Byte(coef) * Byte(x)).byte for x in range(256)]
+
+def _coefs(mat):
+    """
+    Coefficients of a 4x4 mixing matrix as a list of lists of int
+    """
+    return [[mat[i,k].byte for k in range(4)] for i in range(4)]
+
+# NumPy is imported and the tables below are built on first use, see _load
+_LAZY = ("np", "HAVE_NUMPY", "SBox_arr", "InvSBox_arr", "MixColumns_coefs", "InvMixColumns_coefs", "Mul_tables")
+_loaded = False
+
+def _load():
+    """
+    Imports NumPy and builds the tables, the products are read from the table cache file
+    - output: (bool) HAVE_NUMPY
+    """
+    global _loaded, np, HAVE_NUMPY, SBox_arr, InvSBox_arr, MixColumns_coefs, InvMixColumns_coefs, Mul_tables
+    if _loaded:
+        return HAVE_NUMPY
+    try:
+        import numpy as np
+        HAVE_NUMPY = True
+    except ImportError:
+        np = None
+        HAVE_NUMPY = False
+    MixColumns_coefs = _coefs(MixColumns_mat)
+    InvMixColumns_coefs = _coefs(InvMixColumns_mat)
+    if HAVE_NUMPY:
+        SBox_arr = np.array(SBox, dtype=np.uint8)
+        InvSBox_arr = np.array(InvSBox, dtype=np.uint8)
+        # Products by {02}, {03} (xtime tables) and {09}, {0b}, {0d}, {0e}
+        coefs = set(sum(MixColumns_coefs + InvMixColumns_coefs, [])) - {1}
+        Mul_tables = {c: np.frombuffer(table, dtype=np.uint8) for c, table in
+                      table_cache.cached("numpy.Mul", lambda: {c: bytes(_mul_table(c)) for c in coefs}, 256).items()}
+    _loaded = True
+    return HAVE_NUMPY
+
+def __getattr__(name):
+    if name in _LAZY:
+        _load()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+# State byte 4*c + r is row r, column c. ShiftRows moves (r, c+r) to (r, c)
+ShiftRows_perm = [4*((c + r) % 4) + r for c in range(4) for r in range(4)]
+InvShiftRows_perm = [4*((c - r) % 4) + r for c in range(4) for r in range(4)]
+
+def _mix(state, coefs):
+    """
+    MixColumns (or InvMixColumns) on an (N,16) array
+    """
+    cols = state.reshape(-1, 4, 4)
+    out = np.empty_like(cols)
+    for i in range(4):
+        acc = None
+        for k in range(4):
+            term = cols[:, :, k] if (coefs[i][k] == 1) else Mul_tables[coefs[i][k]][cols[:, :, k]]
+            acc = term.copy() if (acc is None) else (acc ^ term)
+        out[:, :, i] = acc
+    return out.reshape(-1, 16)
+
+def expand_key(key):
+    """
+    Round keys for the engine
+    - input: (bytes, 16/24/32 B) key
+    - output: ((Nr+1, 16) uint8 array) round keys, or (tuple) ek, dk of the ttable engine without NumPy
+    """
+    ek = ttable.expand_key(key)
+    if not _load():
+        return ek, ttable.inverse_key(ek)
+    return np.frombuffer(b''.join(w.to_bytes(4, 'big') for w in ek), dtype=np.uint8).reshape(-1, 16).copy()
+
+def _sub_word_arr(words):
+    """
+    SubWord on a uint32 array
+    """
+    out = np.zeros_like(words)
+    for shift in (24, 16, 8, 0):
+        out |= SBox_arr[(words >> shift) & 0xff].astype(np.uint32) << shift
+    return out
+
+def expand_keys(keys):
+    """
+    KeyExpansion of many keys of the same size at once, vectorized over the keys
+    - input: (list of bytes, 16/24/32 B each, or (N, Nk*4) uint8 array) keys
+    - output: ((N, Nr+1, 16) uint8 array) round keys, or (bytes) the same
+              N*(Nr+1)*16 bytes without NumPy
+    """
+    if not _load():
+        return b''.join([b''.join([w.to_bytes(4, 'big') for w in ttable.expand_key(bytes(key))]) for key in keys])
+    if type(keys) != np.ndarray:
+        keys = [bytes(key) for key in keys]
+        try:
+            assert len(set(map(len, keys))) <= 1
+        except AssertionError:
+            raise ValueError("Keys should all have the same size.")
+        keys = np.frombuffer(b''.join(keys), dtype=np.uint8).reshape(len(keys), -1)
+    try:
+        assert keys.shape[1] in (16, 24, 32)
+    except AssertionError:
+        raise ValueError("Key should be 16, 24 or 32 bytes.")
+    Nk = keys.shape[1] // 4
+    Nr = 10 + (Nk - 4)
+
+    W = np.empty((keys.shape[0], 4*(Nr+1)), dtype=np.uint32)
+    W[:, :Nk] = np.ascontiguousarray(keys).view('>u4')
+    for j in range(Nk, 4*(Nr+1)):
+        tmp = W[:, j-1]
+        if (j%Nk == 0):
+            tmp = _sub_word_arr((tmp << 8) | (tmp >> 24)) ^ np.uint32(ttable.Rcon_words[j // Nk - 1])
+        elif (Nk > 6) and (j%Nk == 4):
+            tmp = _sub_word_arr(tmp)
+        W[:, j] = W[:, j-Nk] ^ tmp
+    return W.astype('>u4').view(np.uint8).reshape(-1, Nr+1, 16)
+
+def encrypt_array(blocks, rk):
+    """
+    AES cipher on an (N,16) uint8 array of blocks
+    - input: ((N,16) uint8 array) blocks, ((Nr+1,16) uint8 array) rk
+    - output: ((N,16) uint8 array) ciphertexts
+    """
+    _load()
+    Nr = rk.shape[0] - 1
+    state = blocks ^ rk[0]
+    for i in range(1, Nr):
+        state = _mix(SBox_arr[state][:, ShiftRows_perm], MixColumns_coefs) ^ rk[i]
+    return SBox_arr[state][:, ShiftRows_perm] ^ rk[Nr]
+
+def decrypt_array(blocks, rk):
+    """
+    AES inverse cipher on an (N,16) uint8 array of blocks
+    - input: ((N,16) uint8 array) blocks, ((Nr+1,16) uint8 array) rk, encryption round keys
+    - output: ((N,16) uint8 array) plaintexts
+    """
+    _load()
+    Nr = rk.shape[0] - 1
+    state = blocks ^ rk[Nr]
+    for i in range(Nr-1, 0, -1):
+        state = _mix(InvSBox_arr[state[:, InvShiftRows_perm]] ^ rk[i], InvMixColumns_coefs)
+    return InvSBox_arr[state[:, InvShiftRows_perm]] ^ rk[0]
+
+def _crypt_blocks_into(data, out, offset, schedule, decrypt):
+    """
+    Processes the blocks of data and writes them at an offset of out
+    """
+    try:
+        assert len(data) % 16 == 0
+    except AssertionError:
+        raise ValueError("Data should be a multiple of 16 bytes. Padding is not handled.")
+    if not _load():
+        crypt = ttable.decrypt_into if decrypt else ttable.encrypt_into
+        rk = schedule[1] if decrypt else schedule[0]
+        for k in range(0, len(data), 16):
+            crypt(data, k, out, offset + k, rk)
+        return len(data)
+    crypt = decrypt_array if decrypt else encrypt_array
+    blocks = np.frombuffer(data, dtype=np.uint8).reshape(-1, 16)
+    target = np.frombuffer(out, dtype=np.uint8, count=len(data), offset=offset).reshape(-1, 16)
+    target[...] = crypt(blocks, schedule)
+    return len(data)
+
+def _crypt_blocks(data, schedule, decrypt):
+    if _load() and (type(data) == np.ndarray):
+        return (decrypt_array if decrypt else encrypt_array)(data.reshape(-1, 16), schedule)
+    out = bytearray(len(data))
+    _crypt_blocks_into(data, out, 0, schedule, decrypt)
+    return bytes(out)
+
+def encrypt_blocks(data, schedule):
+    """
+    Encrypts independent blocks (ECB) at once
+    - input: (bytes-like, multiple of 16 B, or (N,16) uint8 array) data, schedule from expand_key
+    - output: (bytes or (N,16) uint8 array, same as data) ciphertexts
+    """
+    return _crypt_blocks(data, schedule, False)
+
+def decrypt_blocks(data, schedule):
+    """
+    Decrypts independent blocks (ECB) at once
+    - input: (bytes-like, multiple of 16 B, or (N,16) uint8 array) data, schedule from expand_key
+    - output: (bytes or (N,16) uint8 array, same as data) plaintexts
+    """
+    return _crypt_blocks(data, schedule, True)
+
+def encrypt_blocks_into(data, out, offset, schedule):
+    """
+    Encrypts independent blocks (ECB) into a writable buffer at an offset
+    - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset, schedule from expand_key
+    - output: (int) number of bytes written
+    """
+    return _crypt_blocks_into(data, out, offset, schedule, False)
+
+def decrypt_blocks_into(data, out, offset, schedule):
+    """
+    Decrypts independent blocks (ECB) into a writable buffer at an offset
+    - input: (buffer, multiple of 16 B) data, (writable buffer) out, (int) offset, schedule from expand_key
+    - output: (int) number of bytes written
+    """
+    return _crypt_blocks_into(data, out, offset, schedule, True)
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Parallel encryption of large buffers over a process pool for AES Cipher
+           (CTR, ECB and CBC decryption, whose blocks are independent)
+"""
+
+#-- Import --#
+import concurrent.futures
+import os
+from multiprocessing import shared_memory
+from modes import *
+#- End Import -#
+
+# Default size of the chunk handed to a worker (1 MiB)
+CHUNK_SIZE = 1 << 20
+
+# Cipher of the worker process, set by _init_worker
+_worker_cipher = None
+
+def _init_worker(key, backend):
+    """
+    Expands the key once per worker process
+    """
+    global _worker_cipher
+    _worker_cipher = AES(key, backend)
+
+def _attach(name):
+    """
+    Attaches to a shared memory block created by the parent process, which owns it.
+    Workers share the resource tracker of the parent, the block is unlinked once.
+    """
+    return shared_memory.SharedMemory(name=name)
+
+def _run_chunk(op, name, start, length, total, param):
+    """
+    Processes data[start:start+length] of the input region into the output region, both
+    are used in place through views on the shared memory
+    - input: (str) op, (str) name of the shared memory, (int) start, (int) length,
+             (int) total input length, (int or bytes) counter block or chaining value
+    """
+    shm = _attach(name)
+    try:
+        with shm.buf[start:start+length] as src, shm.buf[total+start:total+start+length] as dst:
+            if op == "ctr":
+                # The keystream is written to the output region then XORed with the input,
+                # the region is followed by a spare block for the end of the last keystream block
+                nblocks = (length + BLOCK_SIZE - 1) // BLOCK_SIZE
+                ctr_keystream_into(_worker_cipher, param, nblocks, shm.buf, total + start)
+                xor_into(src, dst, dst)
+            elif op == "ecb_encrypt":
+                _worker_cipher.encrypt_blocks_into(src, shm.buf, total + start)
+            elif op == "ecb_decrypt":
+                _worker_cipher.decrypt_blocks_into(src, shm.buf, total + start)
+            else:
+                # P_i = D(C_i) + C_i-1, C_-1 being the chaining value of the chunk
+                _worker_cipher.decrypt_blocks_into(src, shm.buf, total + start)
+                xor_into(dst[:BLOCK_SIZE], param, dst[:BLOCK_SIZE])
+                xor_into(dst[BLOCK_SIZE:], src[:length-BLOCK_SIZE], dst[BLOCK_SIZE:])
+    finally:
+        shm.close()
+
+class ParallelCipher:
+    """
+    Process pool whose workers hold the expanded key, chunks of the input are
+    processed in place in a shared memory block
+    - attributes : (int) workers, (int) chunk_size
+    - methods : *init, *enter, *exit, close, ctr, ecb_encrypt, ecb_decrypt, cbc_decrypt
+    """
+
+    def __init__(self, key, workers=None, chunk_size=CHUNK_SIZE, backend="ttable"):
+        """
+        - input: (bytes) key, (int) workers (default: CPU count), (int) chunk_size rounded
+                 down to a multiple of 16 bytes, (str) backend of the workers
+        """
+        try:
+            assert (workers is None) or ((type(workers) == int) and (workers > 0))
+            assert (type(chunk_size) == int) and (chunk_size >= BLOCK_SIZE)
+        except AssertionError:
+            raise ValueError("Workers and chunk size must be positive integers.")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size - chunk_size % BLOCK_SIZE
+        # Serial path for small inputs, same key schedule
+        self._cipher = AES(key, backend)
+        self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers,
+                                                            initializer=_init_worker,
+                                                            initargs=(key, backend))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Shuts the process pool down
+        - output: None
+        """
+        self._pool.shutdown()
+
+    def _map(self, op, data, params):
+        """
+        Runs op over the chunks of data, params gives the parameter of the chunk at an offset.
+        The workers write into the shared memory, the output is copied out once
+        """
+        total = len(data)
+        shm = shared_memory.SharedMemory(create=True, size=2*total + BLOCK_SIZE)
+        try:
+            shm.buf[:total] = data
+            futures = [self._pool.submit(_run_chunk, op, shm.name, start,
+                                         min(self.chunk_size, total - start), total, params(start))
+                       for start in range(0, total, self.chunk_size)]
+            for future in futures:
+                future.result()
+            with shm.buf[total:2*total] as out:
+                return bytes(out)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def ctr(self, data, iv):
+        """
+        CTR encryption (and decryption), same output as modes.ctr_encrypt
+        - input: (bytes) data, (bytes, 16 B) iv initial counter block
+        - output: (bytes) no name
+        """
+        if len(data) <= self.chunk_size:
+            return CTR(self._cipher, iv).encrypt(data)
+        counter = initial_counter(iv)
+        return self._map("ctr", data, lambda start: (counter + start // BLOCK_SIZE) & COUNTER_MASK)
+
+    def ecb_encrypt(self, data, padding=True):
+        """
+        ECB encryption, same output as modes.ecb_encrypt
+        - input: (bytes) data, (bool) padding with PKCS#7
+        - output: (bytes) ciphertext
+        """
+        data = pkcs7_pad(data) if padding else data
+        if len(data) <= self.chunk_size:
+            return ECB(self._cipher).encrypt(data)
+        try:
+            assert len(data) % BLOCK_SIZE == 0
+        except AssertionError:
+            raise ValueError("Data should be a multiple of 16 bytes. Use padding.")
+        return self._map("ecb_encrypt", data, lambda start: None)
+
+    def ecb_decrypt(self, data, padding=True):
+        """
+        ECB decryption, same output as modes.ecb_decrypt
+        - input: (bytes) data, (bool) padding with PKCS#7
+        - output: (bytes) plaintext
+        """
+        if len(data) <= self.chunk_size:
+            plaintext = ECB(self._cipher).decrypt(data)
+        else:
+            try:
+                assert len(data) % BLOCK_SIZE == 0
+            except AssertionError:
+                raise ValueError("Data should be a multiple of 16 bytes. Use padding.")
+            plaintext = self._map("ecb_decrypt", data, lambda start: None)
+        return pkcs7_unpad(plaintext) if padding else plaintext
+
+    def cbc_decrypt(self, data, iv, padding=True):
+        """
+        CBC decryption, each chunk is chained on the last ciphertext block of the previous one
+        - input: (bytes) data, (bytes, 16 B) iv, (bool) padding with PKCS#7
+        - output: (bytes) plaintext
+        """
+        if len(data) <= self.chunk_size:
+            plaintext = CBC(self._cipher, iv).decrypt(data)
+        else:
+            try:
+                assert len(data) % BLOCK_SIZE == 0
+                assert len(iv) == BLOCK_SIZE
+            except AssertionError:
+                raise ValueError("Data should be a multiple of 16 bytes and IV 16 bytes.")
+            plaintext = self._map("cbc_decrypt", data,
+                                  lambda start: bytes(iv) if (start == 0) else bytes(data[start-BLOCK_SIZE:start]))
+        return pkcs7_unpad(plaintext) if padding else plaintext
+
+def parallel_ctr(data, key, iv, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    CTR encryption (and decryption) over a temporary process pool
+    - input: (bytes) data, (bytes) key, (bytes, 16 B) iv, (int) workers, (int) chunk_size
+    - output: (bytes) no name
+    """
+    with ParallelCipher(key, workers, chunk_size) as pc:
+        return pc.ctr(data, iv)
+
+def parallel_ecb_encrypt(data, key, padding=True, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    ECB encryption over a temporary process pool
+    - input: (bytes) data, (bytes) key, (bool) padding, (int) workers, (int) chunk_size
+    - output: (bytes) ciphertext
+    """
+    with ParallelCipher(key, workers, chunk_size) as pc:
+        return pc.ecb_encrypt(data, padding)
+
+def parallel_ecb_decrypt(data, key, padding=True, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    ECB decryption over a temporary process pool
+    - input: (bytes) data, (bytes) key, (bool) padding, (int) workers, (int) chunk_size
+    - output: (bytes) plaintext
+    """
+    with ParallelCipher(key, workers, chunk_size) as pc:
+        return pc.ecb_decrypt(data, padding)
+
+def parallel_cbc_decrypt(data, key, iv, padding=True, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    CBC decryption over a temporary process pool
+    - input: (bytes) data, (bytes) key, (bytes, 16 B) iv, (bool) padding, (int) workers, (int) chunk_size
+    - output: (bytes) plaintext
+    """
+    with ParallelCipher(key, workers, chunk_size) as pc:
+        return pc.cbc_decrypt(data, iv, padding)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Opt-in per-stage instrumentation of AES Cipher. While a Profiler is
+           enabled, the stage functions are replaced by counting wrappers in the
+           modules using them; disabled, the original functions are restored and
+           nothing is left on the hot path.
+"""
+
+#-- Import --#
+import functools
+import inspect
+import sys
+import threading
+import time
+import aes_functions
+import cipher
+import ttable
+import numpy_backend
+import bitslice
+import compiled
+#- End Import -#
+
+# Instrumented functions, per module or class
+STAGES = {
+    aes_functions: ("Enc", "Dec", "Cipher", "InvCipher", "KeyExpansion", "SubBytes", "ShiftRows",
+                    "MixColumns", "AddRoundKey", "InvSubBytes", "InvShiftRows", "InvMixColumns",
+                    "RotWord", "bytes2ByteMatrix", "ByteMatrix2bytes"),
+    cipher: ("Cipher", "InvCipher", "KeyExpansion", "SubBytes", "ShiftRows", "MixColumns", "AddRoundKey",
+             "InvSubBytes", "InvShiftRows", "InvMixColumns", "bytes2ByteMatrix", "ByteMatrix2bytes"),
+    cipher.AES: ("encrypt_block", "decrypt_block", "encrypt_into", "decrypt_into", "encrypt_blocks",
+                 "decrypt_blocks", "encrypt_blocks_into", "decrypt_blocks_into"),
+    ttable: ("expand_key", "inverse_key", "encrypt_block", "decrypt_block", "encrypt_into", "decrypt_into"),
+    numpy_backend: ("expand_key", "encrypt_blocks", "decrypt_blocks", "encrypt_blocks_into", "decrypt_blocks_into"),
+    bitslice: ("expand_key", "encrypt_block", "decrypt_block", "encrypt_blocks", "decrypt_blocks",
+               "encrypt_blocks_into", "decrypt_blocks_into"),
+    compiled: ("compile_key", "compile_schedule", "encrypt_block", "decrypt_block", "encrypt_blocks_into",
+               "decrypt_blocks_into"),
+}
+
+# Entry points setting the key size of the nested stages from their key argument. The methods
+# of a class in STAGES are entry points too, the key size is the Nr of the cipher object
+ENTRY_POINTS = ("Enc", "Dec")
+
+_active = None
+
+class Profiler:
+    """
+    Per-stage call counts, cumulative nanoseconds and allocations, keyed by
+    (stage, Nr). Nr is known inside Enc/Dec and the methods of AES objects, it is None
+    for stages called elsewhere. The methods are reported as "AES.<name>".
+    - attributes : (function) callback, (bool) track_allocations
+    - methods : *init, *enter, *exit, enable, disable, reset, stats, report, export
+    """
+
+    def __init__(self, callback=None, track_allocations=False):
+        """
+        - input: (function) callback called after each stage with (stage, Nr, ns, allocations),
+                 (bool) track_allocations counts the memory blocks left allocated by each stage
+        """
+        self.callback = callback
+        self.track_allocations = track_allocations
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._originals = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def _record(self, stage, Nr, ns, allocations):
+        with self._lock:
+            entry = self._stats.get((stage, Nr))
+            if entry is None:
+                entry = self._stats[(stage, Nr)] = {"calls": 0, "ns": 0, "allocations": 0}
+            entry["calls"] += 1
+            entry["ns"] += ns
+            entry["allocations"] += allocations
+        if self.callback is not None:
+            self.callback(stage, Nr, ns, allocations)
+
+    def _wrap(self, stage, func, method=False):
+        local = self._local
+        track = self.track_allocations
+        entry_point = method or (stage in ENTRY_POINTS)
+        signature = inspect.signature(func) if entry_point else None
+        perf_counter_ns, getallocatedblocks = time.perf_counter_ns, sys.getallocatedblocks
+
+        def key_Nr(args, kwargs):
+            """
+            Nr of the key of an entry point, or of the cipher object of a method, however it
+            is passed. None when the call is invalid, the error is left to the function itself
+            """
+            try:
+                if method:
+                    return signature.bind(*args, **kwargs).arguments["self"].Nr
+                return len(aes_functions.PadKey(signature.bind(*args, **kwargs).arguments["key"])) // 4 + 6
+            except (TypeError, KeyError, AttributeError):
+                return None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            outer_Nr = getattr(local, "Nr", None)
+            if entry_point:
+                local.Nr = key_Nr(args, kwargs)
+            blocks = getallocatedblocks() if track else 0
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ns = perf_counter_ns() - start
+                allocations = (getallocatedblocks() - blocks) if track else 0
+                self._record(stage, getattr(local, "Nr", None), ns, allocations)
+                local.Nr = outer_Nr
+        return wrapper
+
+    def enable(self):
+        """
+        Installs the counting wrappers
+        - output: None
+        """
+        global _active
+        if _active is not None:
+            raise RuntimeError("A profiler is already enabled.")
+        _active = self
+        for owner, names in STAGES.items():
+            method = isinstance(owner, type)
+            for name in names:
+                func = getattr(owner, name)
+                self._originals.append((owner, name, func))
+                stage = "{}.{}".format(owner.__name__, name) if method else name
+                setattr(owner, name, self._wrap(stage, func, method))
+
+    def disable(self):
+        """
+        Restores the original functions
+        - output: None
+        """
+        global _active
+        for owner, name, func in reversed(self._originals):
+            setattr(owner, name, func)
+        self._originals = []
+        if _active is self:
+            _active = None
+
+    def reset(self):
+        """
+        Clears the counters
+        - output: None
+        """
+        with self._lock:
+            self._stats = {}
+
+    def stats(self):
+        """
+        Returns a copy of the counters
+        - output: (dict) {(stage, Nr): {"calls", "ns", "allocations"}}
+        """
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.items()}
+
+    def report(self):
+        """
+        Text report sorted by cumulative time
+        - output: (str) string
+        """
+        string = "{:<24} {:>4} {:>10} {:>14} {:>10} {:>12}\n".format(
+            "stage", "Nr", "calls", "total (ms)", "ns/call", "allocations")
+        for (stage, Nr), entry in sorted(self.stats().items(), key=lambda kv: -kv[1]["ns"]):
+            string += "{:<24} {:>4} {:>10} {:>14.3f} {:>10.0f} {:>12}\n".format(
+                stage, '-' if (Nr is None) else Nr, entry["calls"], entry["ns"] / 1e6,
+                entry["ns"] / entry["calls"], entry["allocations"])
+        return string
+
+    def export(self, exporter):
+        """
+        Hands the counters to an exporter, e.g. json.dump or a metrics client
+        - input: (function) exporter taking a list of dict
+        - output: what exporter returns
+        """
+        return exporter([dict(stage=stage, Nr=Nr, **entry) for (stage, Nr), entry in self.stats().items()])
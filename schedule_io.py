@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Binary format of expanded key schedules for AES Cipher.
+           A record is an 8-byte header (magic b'AESK', version, Nr, reserved)
+           followed by the 4*(Nr+1) words of the encryption schedule in big-endian
+           order, i.e. the round keys as blocks: 176, 208 or 240 bytes.
+           Records can be concatenated in one file or buffer.
+"""
+
+#-- Import --#
+import struct
+from byte import *
+#- End Import -#
+
+MAGIC = b'AESK'
+VERSION = 1
+_header = struct.Struct('>4sBBH')
+HEADER_SIZE = _header.size
+
+def record_size(Nr):
+    """
+    Size of a record in bytes
+    - input: (int) Nr
+    - output: (int) no name
+    """
+    return HEADER_SIZE + 16*(Nr+1)
+
+def schedule_words(schedule):
+    """
+    Words of an encryption schedule
+    - input: (list of int) ek, (list of ByteMatrix objects) round keys, (4x4(Nr+1) ByteMatrix object) W,
+             ((Nr+1,16) uint8 array) round keys of the numpy backend or (bytes) of the bitslice backend
+    - output: (list of int) ek
+    """
+    if type(schedule) in (bytes, bytearray):
+        return list(struct.unpack('>{}I'.format(len(schedule) // 4), schedule))
+    if type(schedule) in MATRIX_TYPES:
+        return [int.from_bytes(bytes([schedule[i,j].byte for i in range(4)]), 'big') for j in range(schedule.n)]
+    if hasattr(schedule, "tobytes"):
+        data = schedule.tobytes()
+        return list(struct.unpack('>{}I'.format(len(data) // 4), data))
+    if all(type(w) == int for w in schedule):
+        return list(schedule)
+    return sum([schedule_words(round_key) for round_key in schedule], [])
+
+def dump_schedule(schedule):
+    """
+    Serializes an encryption schedule
+    - input: schedule, see schedule_words
+    - output: (bytes) record
+    """
+    ek = schedule_words(schedule)
+    Nr = len(ek) // 4 - 1
+    try:
+        assert Nr in (10, 12, 14) and (len(ek) == 4*(Nr+1))
+    except AssertionError:
+        raise ValueError("Schedule should have 44, 52 or 60 words.")
+    return _header.pack(MAGIC, VERSION, Nr, 0) + struct.pack('>{}I'.format(len(ek)), *ek)
+
+def dump_schedules(schedules):
+    """
+    Serializes several schedules into one buffer
+    - input: (iterable) schedules
+    - output: (bytes) records
+    """
+    return b''.join([dump_schedule(schedule) for schedule in schedules])
+
+def read_header(buf, offset=0):
+    """
+    Checks the header of the record at an offset
+    - input: (buffer) buf, (int) offset
+    - output: (int) Nr
+    """
+    try:
+        magic, version, Nr, _ = _header.unpack_from(buf, offset)
+    except struct.error:
+        raise ValueError("Truncated key schedule record.")
+    if magic != MAGIC:
+        raise ValueError("Not a key schedule record.")
+    if version != VERSION:
+        raise ValueError("Unsupported key schedule version {}.".format(version))
+    if Nr not in (10, 12, 14):
+        raise ValueError("Invalid number of rounds {}.".format(Nr))
+    if len(memoryview(buf).cast('B')) < offset + record_size(Nr):
+        raise ValueError("Truncated key schedule record.")
+    return Nr
+
+def load_schedule(buf, offset=0):
+    """
+    Reads the words of the record at an offset, the buffer is not copied
+    - input: (buffer) buf, (int) offset
+    - output: (list of int) ek
+    """
+    Nr = read_header(buf, offset)
+    return list(struct.unpack_from('>{}I'.format(4*(Nr+1)), buf, offset + HEADER_SIZE))
+
+def iter_records(buf):
+    """
+    Offsets of the concatenated records of a buffer
+    - input: (buffer) buf
+    - output: (generator of tuples) offset, Nr
+    """
+    view = memoryview(buf).cast('B')
+    offset = 0
+    while offset < len(view):
+        Nr = read_header(view, offset)
+        yield offset, Nr
+        offset += record_size(Nr)
+
+def load_schedules(buf):
+    """
+    Reads all the records of a buffer
+    - input: (buffer) buf
+    - output: (list of lists of int) schedules
+    """
+    return [load_schedule(buf, offset) for offset, _ in iter_records(buf)]
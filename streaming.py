@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Incremental encryption and decryption over streams for AES Cipher
+"""
+
+#-- Import --#
+from modes import *
+#- End Import -#
+
+# Default size of the chunks read from file-like objects (1 MiB)
+CHUNK_SIZE = 1 << 20
+
+class _StreamCipher:
+    """
+    Incremental cipher in one direction, whole-block modes (ECB, CBC) carry the
+    trailing partial block over to the next call
+    """
+    _decrypting = False
+
+    def __init__(self, mode, key, iv=None, padding=True):
+        """
+        The key is expanded once for the whole stream
+        - input: (str) mode in MODES, (bytes or AES object) key, (bytes, 16 B) iv, (bool) padding
+                 with PKCS#7 (ECB and CBC only)
+        """
+        try:
+            assert mode in MODES
+        except AssertionError:
+            raise ValueError("Unknown mode, must be one of {}.".format(', '.join(MODES)))
+        self._mode = MODES[mode](key) if (mode == "ecb") else MODES[mode](key, iv)
+        self._blockwise = mode in ("ecb", "cbc")
+        self._padding = padding and self._blockwise
+        self._carry = b''
+        self._finalized = False
+
+    def _run(self, data):
+        return self._mode.decrypt(data) if self._decrypting else self._mode.encrypt(data)
+
+    def _run_into(self, data, out, offset):
+        if self._decrypting:
+            return self._mode.decrypt_into(data, out, offset)
+        return self._mode.encrypt_into(data, out, offset)
+
+    def _split(self, data):
+        """
+        Pieces of carry + data processed now, the rest is carried over. The data is
+        sliced through a memoryview, only the block completing the carry is rebuilt
+        - input: (bytes-like) data
+        - output: (list of buffers, multiples of 16 B) pieces
+        """
+        view = memoryview(data).cast('B')
+        carry = self._carry
+        total = len(carry) + len(view)
+        cut = total - total % BLOCK_SIZE
+        # With padding, the last block of the ciphertext is only decrypted by finalize
+        if self._padding and self._decrypting and (cut == total) and cut:
+            cut -= BLOCK_SIZE
+        if cut == 0:
+            self._carry = carry + bytes(view)
+            return []
+        # The carry is at most one block
+        start = (BLOCK_SIZE - len(carry)) if carry else 0
+        end = cut - len(carry)
+        pieces = [carry + bytes(view[:start])] if carry else []
+        if end > start:
+            pieces.append(view[start:end])
+        self._carry = bytes(view[end:])
+        return pieces
+
+    def update(self, data):
+        """
+        Processes a chunk, returns the output available so far
+        - input: (bytes-like) data
+        - output: (bytes) no name
+        """
+        if self._finalized:
+            raise ValueError("Cipher was already finalized.")
+        if not self._blockwise:
+            return self._run(data)
+        return b''.join([self._run(piece) for piece in self._split(data)])
+
+    def update_into(self, data, out):
+        """
+        Processes a chunk and writes the output available so far into out, through the
+        *_into methods of the mode (CFB and OFB still compute their output before copying it)
+        - input: (bytes-like) data, (writable buffer) out of at least len(data) + 15 bytes,
+                 not overlapping data
+        - output: (int) number of bytes written
+        """
+        if self._finalized:
+            raise ValueError("Cipher was already finalized.")
+        try:
+            assert len(out) >= len(data) + BLOCK_SIZE - 1
+        except AssertionError:
+            raise ValueError("Output buffer should be at least len(data) + 15 bytes.")
+        pieces = self._split(data) if self._blockwise else [data]
+        written = 0
+        for piece in pieces:
+            written += self._run_into(piece, out, written)
+        return written
+
+    def finalize(self):
+        """
+        Ends the stream, returns the remaining output (padding is applied or removed here)
+        - output: (bytes) no name
+        """
+        if self._finalized:
+            raise ValueError("Cipher was already finalized.")
+        self._finalized = True
+        carry, self._carry = self._carry, b''
+        if not self._blockwise:
+            return b''
+        if self._decrypting:
+            if len(carry) % BLOCK_SIZE:
+                raise ValueError("Ciphertext is not a multiple of 16 bytes.")
+            plaintext = self._run(carry)
+            return pkcs7_unpad(plaintext) if self._padding else plaintext
+        if self._padding:
+            return self._run(pkcs7_pad(carry))
+        if carry:
+            raise ValueError("Data is not a multiple of 16 bytes. Use padding.")
+        return b''
+
+class Encryptor(_StreamCipher):
+    """
+    Incremental encryption
+    - methods : *init, update, update_into, finalize
+    """
+    _decrypting = False
+
+class Decryptor(_StreamCipher):
+    """
+    Incremental decryption
+    - methods : *init, update, update_into, finalize
+    """
+    _decrypting = True
+
+def _crypt_iter(cipher, chunks):
+    for chunk in chunks:
+        out = cipher.update(chunk)
+        if out:
+            yield out
+    out = cipher.finalize()
+    if out:
+        yield out
+
+def encrypt_iter(chunks, key, mode, iv=None, padding=True):
+    """
+    Generator encrypting an iterable of chunks
+    - input: (iterable of bytes) chunks, (bytes or AES object) key, (str) mode, (bytes) iv, (bool) padding
+    - output: (generator of bytes) no name
+    """
+    return _crypt_iter(Encryptor(mode, key, iv, padding), chunks)
+
+def decrypt_iter(chunks, key, mode, iv=None, padding=True):
+    """
+    Generator decrypting an iterable of chunks
+    - input: (iterable of bytes) chunks, (bytes or AES object) key, (str) mode, (bytes) iv, (bool) padding
+    - output: (generator of bytes) no name
+    """
+    return _crypt_iter(Decryptor(mode, key, iv, padding), chunks)
+
+def _crypt_file(cipher, src, dst, chunk_size):
+    """
+    Copies src to dst through cipher with two preallocated buffers
+    """
+    inbuf = bytearray(chunk_size)
+    outbuf = bytearray(chunk_size + BLOCK_SIZE)
+    inview, outview = memoryview(inbuf), memoryview(outbuf)
+    total = 0
+    while True:
+        if hasattr(src, "readinto"):
+            n = src.readinto(inbuf)
+        else:
+            data = src.read(chunk_size)
+            n = len(data)
+            inbuf[:n] = data
+        if not n:
+            break
+        written = cipher.update_into(inview[:n], outview)
+        dst.write(outview[:written])
+        total += written
+    tail = cipher.finalize()
+    dst.write(tail)
+    return total + len(tail)
+
+def encrypt_file(src, dst, key, mode, iv=None, padding=True, chunk_size=CHUNK_SIZE):
+    """
+    Encrypts a file-like object into another one, chunk by chunk
+    - input: (readable binary file) src, (writable binary file) dst, (bytes or AES object) key,
+             (str) mode, (bytes) iv, (bool) padding, (int) chunk_size
+    - output: (int) number of bytes written
+    """
+    return _crypt_file(Encryptor(mode, key, iv, padding), src, dst, chunk_size)
+
+def decrypt_file(src, dst, key, mode, iv=None, padding=True, chunk_size=CHUNK_SIZE):
+    """
+    Decrypts a file-like object into another one, chunk by chunk
+    - input: (readable binary file) src, (writable binary file) dst, (bytes or AES object) key,
+             (str) mode, (bytes) iv, (bool) padding, (int) chunk_size
+    - output: (int) number of bytes written
+    """
+    return _crypt_file(Decryptor(mode, key, iv, padding), src, dst, chunk_size)
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: Optional file cache of the precomputed lookup tables of AES Cipher.
+           When the environment variable AES_TABLE_CACHE names a file, tables are
+           read from it instead of being computed, and written to it after being computed.
+           Each entry holds a SHA-256 digest of its tables, an entry of the wrong size or
+           digest is rebuilt and rewritten instead of being used.
+"""
+
+#-- Import --#
+import marshal
+import os
+#- End Import -#
+
+ENV_VAR = "AES_TABLE_CACHE"
+# Bumped when the content or the format of a table changes
+VERSION = 2
+
+_tables = None
+
+def _path():
+    return os.environ.get(ENV_VAR)
+
+def _read():
+    global _tables
+    if _tables is None:
+        _tables = {}
+        path = _path()
+        if path:
+            try:
+                with open(path, "rb") as f:
+                    data = marshal.load(f)
+                if (type(data) == dict) and (data.get("version") == VERSION):
+                    _tables = data
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+    return _tables
+
+def _write():
+    path = _path()
+    if not path:
+        return
+    tmp = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        with open(tmp, "wb") as f:
+            marshal.dump(dict(_tables, version=VERSION), f)
+        os.replace(tmp, path)
+    except OSError:
+        # The cache is an optimization, a read-only location is not an error
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+def _items(value):
+    """
+    Tables of an entry with their keys, in a fixed order
+    - input: (list or dict of bytes) value
+    - output: (list of tuples) key, table
+    """
+    return sorted(value.items()) if (type(value) == dict) else list(enumerate(value))
+
+def _digest(value):
+    # hashlib takes about 2 ms to import, only paid when a cache file is used
+    import hashlib
+    h = hashlib.sha256()
+    for key, table in _items(value):
+        h.update(str(key).encode() + b':' + table)
+    return h.digest()
+
+def _valid(entry, size):
+    """
+    Checks the types, the length of each table and the digest of an entry read from the file
+    """
+    try:
+        assert (type(entry) == tuple) and (len(entry) == 2)
+        digest, value = entry
+        assert type(value) in (list, dict)
+        assert all([(type(table) == bytes) and (len(table) == size) for _, table in _items(value)])
+        return digest == _digest(value)
+    except (AssertionError, TypeError):
+        return False
+
+def cached(name, build, size):
+    """
+    Returns a table from the cache file, or builds it and stores it. A corrupted entry
+    is rebuilt and the file rewritten
+    - input: (str) name, (function) build without argument returning a list or a dict
+             of packed tables (bytes), (int) size in bytes of each table
+    - output: the tables, as returned by build
+    """
+    tables = _read()
+    if not _valid(tables.get(name), size):
+        value = build()
+        tables[name] = (_digest(value), value)
+        _write()
+    return tables[name][1]
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+    Created: 10/18/2026
+    Last modification: 10/18/2026
+
+    @creator: coconutj
+
+    Brief: T-table (32-bit word) round engine for AES Cipher
+"""
+
+#-- Import --#
+import struct
+from constants import *
+import table_cache
+#- End Import -#
+
+# A block as four big-endian 32-bit words, one per column
+_words = struct.Struct('>4I')
+# A table of 256 words as stored in the table cache, fixed width and byte order
+_table = struct.Struct('<256I')
+
+def _build_tables(box, mat):
+    """
+    Builds the four lookup tables fusing a S-box with the columns of a mixing matrix
+    - input: (list) box, (4x4 ByteMatrix object) mat
+    - output: (list of 4 lists of 256 int) tables
+    """
+    tables = []
+    for k in range(4):
+        coefs = [mat[i,k] for i in range(4)]
+        table = []
+        for x in range(256):
+            s = Byte(box[x])
+            word = 0
+            for coef in coefs:
+                word = (word << 8) | (coef * s).byte
+            table.append(word)
+        tables.append(table)
+    return tables
+
+# Te0..Te3 and Td0..Td3 are built on first use, see _load_tables
+_TABLES = ("Te0", "Te1", "Te2", "Te3", "Td0", "Td1", "Td2", "Td3")
+_loaded = False
+
+def _load_tables():
+    """
+    Builds the tables, or reads them from the table cache file
+    - output: None
+    """
+    global _loaded, Te0, Te1, Te2, Te3, Td0, Td1, Td2, Td3
+    # The cache holds the tables packed as 256 little-endian 32-bit words
+    pack = lambda box, mat: [_table.pack(*table) for table in _build_tables(box, mat)]
+    Te0, Te1, Te2, Te3 = [list(_table.unpack(table)) for table in
+                          table_cache.cached("ttable.Te", lambda: pack(SBox, MixColumns_mat), _table.size)]
+    Td0, Td1, Td2, Td3 = [list(_table.unpack(table)) for table in
+                          table_cache.cached("ttable.Td", lambda: pack(InvSBox, InvMixColumns_mat), _table.size)]
+    _loaded = True
+
+def __getattr__(name):
+    if name in _TABLES:
+        _load_tables()
+        return globals()[name]
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+# Round constants as words, first byte in the most significant position
+Rcon_words = [Rcon[0,j].byte << 24 for j in range(Rcon.n)]
+
+def SubWord(word):
+    """
+    SubWord operation on a 32-bit word
+    - input: (int) word
+    - output: (int) word
+    """
+    return ((SBox[word >> 24] << 24) | (SBox[(word >> 16) & 0xff] << 16)
+            | (SBox[(word >> 8) & 0xff] << 8) | SBox[word & 0xff])
+
+def expand_key(key):
+    """
+    KeyExpansion algorithm on 32-bit words
+    - input: (bytes, 16/24/32 B) key
+    - output: (list of int) ek, 4*(Nr+1) words
+    """
+    try:
+        assert len(key) in (16, 24, 32)
+    except AssertionError:
+        raise ValueError("Key should be 16, 24 or 32 bytes.")
+    Nk = len(key) // 4
+    Nr = 10 + (Nk - 4)
+
+    ek = [int.from_bytes(key[4*j:4*(j+1)], 'big') for j in range(Nk)]
+    for j in range(Nk, 4*(Nr+1)):
+        tmp = ek[j-1]
+        if (j%Nk == 0):
+            tmp = SubWord(((tmp << 8) & 0xffffffff) | (tmp >> 24)) ^ Rcon_words[j // Nk - 1]
+        elif (Nk > 6) and (j%Nk == 4):
+            tmp = SubWord(tmp)
+        ek.append(ek[j-Nk] ^ tmp)
+    return ek
+
+def inverse_key(ek):
+    """
+    Derives the equivalent inverse cipher schedule from an encryption schedule
+    - input: (list of int) ek
+    - output: (list of int) dk
+    """
+    if not _loaded:
+        _load_tables()
+    Nr = len(ek) // 4 - 1
+    dk = []
+    for r in range(Nr, -1, -1):
+        for c in range(4):
+            w = ek[4*r + c]
+            if 0 < r < Nr:
+                # InvMixColumns of the round key word, the SBox cancels the InvSBox of Td
+                w = (Td0[SBox[w >> 24]] ^ Td1[SBox[(w >> 16) & 0xff]]
+                     ^ Td2[SBox[(w >> 8) & 0xff]] ^ Td3[SBox[w & 0xff]])
+            dk.append(w)
+    return dk
+
+def encrypt_words(s0, s1, s2, s3, ek):
+    """
+    AES cipher on the four column words of a block
+    - input: (int) s0, s1, s2, s3, (list of int) ek
+    - output: (tuple of 4 int) ciphertext words
+    """
+    if not _loaded:
+        _load_tables()
+    Nr = len(ek) // 4 - 1
+
+    # First round
+    s0 ^= ek[0]
+    s1 ^= ek[1]
+    s2 ^= ek[2]
+    s3 ^= ek[3]
+
+    # Middle rounds: SubBytes, ShiftRows and MixColumns fused into the tables
+    for r in range(4, 4*Nr, 4):
+        t0 = Te0[s0 >> 24] ^ Te1[(s1 >> 16) & 0xff] ^ Te2[(s2 >> 8) & 0xff] ^ Te3[s3 & 0xff] ^ ek[r]
+        t1 = Te0[s1 >> 24] ^ Te1[(s2 >> 16) & 0xff] ^ Te2[(s3 >> 8) & 0xff] ^ Te3[s0 & 0xff] ^ ek[r+1]
+        t2 = Te0[s2 >> 24] ^ Te1[(s3 >> 16) & 0xff] ^ Te2[(s0 >> 8) & 0xff] ^ Te3[s1 & 0xff] ^ ek[r+2]
+        t3 = Te0[s3 >> 24] ^ Te1[(s0 >> 16) & 0xff] ^ Te2[(s1 >> 8) & 0xff] ^ Te3[s2 & 0xff] ^ ek[r+3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+
+    # Final round: no MixColumns
+    r = 4*Nr
+    t0 = ((SBox[s0 >> 24] << 24) | (SBox[(s1 >> 16) & 0xff] << 16)
+          | (SBox[(s2 >> 8) & 0xff] << 8) | SBox[s3 & 0xff]) ^ ek[r]
+    t1 = ((SBox[s1 >> 24] << 24) | (SBox[(s2 >> 16) & 0xff] << 16)
+          | (SBox[(s3 >> 8) & 0xff] << 8) | SBox[s0 & 0xff]) ^ ek[r+1]
+    t2 = ((SBox[s2 >> 24] << 24) | (SBox[(s3 >> 16) & 0xff] << 16)
+          | (SBox[(s0 >> 8) & 0xff] << 8) | SBox[s1 & 0xff]) ^ ek[r+2]
+    t3 = ((SBox[s3 >> 24] << 24) | (SBox[(s0 >> 16) & 0xff] << 16)
+          | (SBox[(s1 >> 8) & 0xff] << 8) | SBox[s2 & 0xff]) ^ ek[r+3]
+
+    return t0, t1, t2, t3
+
+def decrypt_words(s0, s1, s2, s3, dk):
+    """
+    AES equivalent inverse cipher on the four column words of a block
+    - input: (int) s0, s1, s2, s3, (list of int) dk, as returned by inverse_key
+    - output: (tuple of 4 int) plaintext words
+    """
+    if not _loaded:
+        _load_tables()
+    Nr = len(dk) // 4 - 1
+
+    # First round
+    s0 ^= dk[0]
+    s1 ^= dk[1]
+    s2 ^= dk[2]
+    s3 ^= dk[3]
+
+    # Middle rounds: InvSubBytes, InvShiftRows and InvMixColumns fused into the tables
+    for r in range(4, 4*Nr, 4):
+        t0 = Td0[s0 >> 24] ^ Td1[(s3 >> 16) & 0xff] ^ Td2[(s2 >> 8) & 0xff] ^ Td3[s1 & 0xff] ^ dk[r]
+        t1 = Td0[s1 >> 24] ^ Td1[(s0 >> 16) & 0xff] ^ Td2[(s3 >> 8) & 0xff] ^ Td3[s2 & 0xff] ^ dk[r+1]
+        t2 = Td0[s2 >> 24] ^ Td1[(s1 >> 16) & 0xff] ^ Td2[(s0 >> 8) & 0xff] ^ Td3[s3 & 0xff] ^ dk[r+2]
+        t3 = Td0[s3 >> 24] ^ Td1[(s2 >> 16) & 0xff] ^ Td2[(s1 >> 8) & 0xff] ^ Td3[s0 & 0xff] ^ dk[r+3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+
+    # Final round: no InvMixColumns
+    r = 4*Nr
+    t0 = ((InvSBox[s0 >> 24] << 24) | (InvSBox[(s3 >> 16) & 0xff] << 16)
+          | (InvSBox[(s2 >> 8) & 0xff] << 8) | InvSBox[s1 & 0xff]) ^ dk[r]
+    t1 = ((InvSBox[s1 >> 24] << 24) | (InvSBox[(s0 >> 16) & 0xff] << 16)
+          | (InvSBox[(s3 >> 8) & 0xff] << 8) | InvSBox[s2 & 0xff]) ^ dk[r+1]
+    t2 = ((InvSBox[s2 >> 24] << 24) | (InvSBox[(s1 >> 16) & 0xff] << 16)
+          | (InvSBox[(s0 >> 8) & 0xff] << 8) | InvSBox[s3 & 0xff]) ^ dk[r+2]
+    t3 = ((InvSBox[s3 >> 24] << 24) | (InvSBox[(s2 >> 16) & 0xff] << 16)
+          | (InvSBox[(s1 >> 8) & 0xff] << 8) | InvSBox[s0 & 0xff]) ^ dk[r+3]
+
+    return t0, t1, t2, t3
+
+def encrypt_block(block, ek):
+    """
+    AES cipher on 32-bit words
+    - input: (bytes, 16 B) block, (list of int) ek
+    - output: (bytes, 16 B) ciphertext
+    """
+    check_block(block)
+    return _words.pack(*encrypt_words(*_words.unpack(block), ek))
+
+def decrypt_block(block, dk):
+    """
+    AES equivalent inverse cipher on 32-bit words
+    - input: (bytes, 16 B) block, (list of int) dk, as returned by inverse_key
+    - output: (bytes, 16 B) plaintext
+    """
+    check_block(block)
+    return _words.pack(*decrypt_words(*_words.unpack(block), dk))
+
+def encrypt_into(src, src_offset, dst, dst_offset, ek):
+    """
+    AES cipher reading the block of any buffer at an offset and writing the
+    ciphertext into a writable buffer at an offset, without intermediate bytes
+    - input: (buffer) src, (int) src_offset, (writable buffer) dst, (int) dst_offset, (list of int) ek
+    - output: None
+    """
+    _words.pack_into(dst, dst_offset, *encrypt_words(*_words.unpack_from(src, src_offset), ek))
+
+def decrypt_into(src, src_offset, dst, dst_offset, dk):
+    """
+    AES equivalent inverse cipher from a buffer at an offset into a writable buffer at an offset
+    - input: (buffer) src, (int) src_offset, (writable buffer) dst, (int) dst_offset, (list of int) dk
+    - output: None
+    """
+    _words.pack_into(dst, dst_offset, *decrypt_words(*_words.unpack_from(src, src_offset), dk))